@@ -4,25 +4,31 @@ import numpy as np
 from math import gcd
 
 class HillCipher:
-    def __init__(self, key_matrix):
+    def __init__(self, key_matrix, verbose=True):
         """
         Initialize Hill Cipher with a key matrix
         key_matrix: 2D list or numpy array representing the key matrix
+        verbose: print the key setup (matrix, determinant, inverse) and every step of encrypt/decrypt
+                 (quiet runs multiply all blocks at once)
         """
         self.key_matrix = np.array(key_matrix, dtype=int)
         self.n = len(key_matrix)  # Size of the matrix (n x n)
+        self.verbose = verbose
         
-        print(f"🔑 Hill Cipher initialized with {self.n}x{self.n} key matrix:")
-        self._print_matrix(self.key_matrix, "Key Matrix")
+        if verbose:
+            print(f"🔑 Hill Cipher initialized with {self.n}x{self.n} key matrix:")
+            self._print_matrix(self.key_matrix, "Key Matrix")
         
         # Check if key matrix is valid (determinant must be coprime with 26)
         det = int(np.round(np.linalg.det(self.key_matrix))) % 26
-        print(f"🔢 Determinant of key matrix: {det}")
+        if verbose:
+            print(f"🔢 Determinant of key matrix: {det}")
         
         if gcd(det, 26) != 1:
             raise ValueError(f"❌ Key matrix is not valid! Determinant {det} is not coprime with 26")
         
-        print(f"✅ Key matrix is valid (gcd({det}, 26) = 1)")
+        if verbose:
+            print(f"✅ Key matrix is valid (gcd({det}, 26) = 1)")
         
         # Calculate inverse matrix for decryption
         self.inv_key_matrix = self._matrix_inverse_mod26()
@@ -82,13 +88,14 @@ class HillCipher:
     
     def _matrix_inverse_mod26(self):
         """Calculate inverse of key matrix modulo 26"""
-        print(f"\n🔄 Calculating inverse matrix for decryption:")
+        if self.verbose:
+            print(f"\n🔄 Calculating inverse matrix for decryption:")
         
         det = int(np.round(np.linalg.det(self.key_matrix))) % 26
-        print(f"📊 Determinant mod 26: {det}")
-        
         det_inv = self._mod_inverse(det, 26)
-        print(f"🔢 Modular inverse of determinant: {det_inv}")
+        if self.verbose:
+            print(f"📊 Determinant mod 26: {det}")
+            print(f"🔢 Modular inverse of determinant: {det_inv}")
         
         # Calculate adjugate matrix
         if self.n == 2:
@@ -100,19 +107,20 @@ class HillCipher:
             # For larger matrices, use numpy's approach with cofactor matrix
             adj_matrix = np.round(np.linalg.det(self.key_matrix) * np.linalg.inv(self.key_matrix)).astype(int)
         
-        print(f"📋 Adjugate matrix:")
-        self._print_matrix(adj_matrix, "Adjugate Matrix")
-        
         # Calculate inverse: inv = (det_inv * adj) mod 26
         inv_matrix = (det_inv * adj_matrix) % 26
         
-        print(f"🎯 Inverse matrix calculation: ({det_inv} * adj_matrix) mod 26")
-        self._print_matrix(inv_matrix, "Inverse Key Matrix")
-        
-        # Verify the inverse
-        verification = (self.key_matrix @ inv_matrix) % 26
-        print(f"✅ Verification (Key × Inverse mod 26):")
-        self._print_matrix(verification, "Verification Matrix")
+        if self.verbose:
+            print(f"📋 Adjugate matrix:")
+            self._print_matrix(adj_matrix, "Adjugate Matrix")
+            
+            print(f"🎯 Inverse matrix calculation: ({det_inv} * adj_matrix) mod 26")
+            self._print_matrix(inv_matrix, "Inverse Key Matrix")
+            
+            # Verify the inverse
+            verification = (self.key_matrix @ inv_matrix) % 26
+            print(f"✅ Verification (Key × Inverse mod 26):")
+            self._print_matrix(verification, "Verification Matrix")
         
         return inv_matrix
     
@@ -200,8 +208,24 @@ class HillCipher:
         
         return result_block
     
+    def _transform(self, text, matrix, pad):
+        """Quiet encrypt/decrypt: the same letters, padding and blocks, one matrix product for all blocks"""
+        text = text.upper().replace(' ', '').replace('J', 'I')
+        text = ''.join(c for c in text if c.isalpha())
+        numbers = np.fromiter(map(ord, text), dtype=np.int64, count=len(text)) - ord('A')
+        if pad and len(numbers) % self.n:
+            numbers = np.concatenate([numbers, np.full(self.n - len(numbers) % self.n, 23)])  # X = 23
+        if len(numbers) % self.n:
+            raise ValueError(f"❌ Ciphertext length must be a multiple of the key size {self.n}")
+        blocks = numbers.reshape(-1, self.n)
+        result = ((blocks @ matrix.T) % 26).ravel() + ord('A')
+        return ''.join(map(chr, result.tolist()))
+
     def encrypt(self, plaintext):
         """Encrypt plaintext using Hill cipher"""
+        if not self.verbose:
+            return self._transform(plaintext, self.key_matrix, pad=True)
+
         print(f"\n🔐 HILL CIPHER ENCRYPTION")
         print("=" * 70)
         print(f"📨 Original plaintext: '{plaintext}'")
@@ -241,6 +265,9 @@ class HillCipher:
     
     def decrypt(self, ciphertext):
         """Decrypt ciphertext using Hill cipher"""
+        if not self.verbose:
+            return self._transform(ciphertext, self.inv_key_matrix, pad=False).rstrip('X')
+
         print(f"\n🔓 HILL CIPHER DECRYPTION")
         print("=" * 70)
         print(f"🔒 Ciphertext: '{ciphertext}'")
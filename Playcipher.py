@@ -1,16 +1,218 @@
 # Online Python compiler (interpreter) to run Python online.
 # Write Python 3 code in this online editor and run it.
+import numpy as np
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # No J
+
+FILLER = ord('X')
+
+
+def code_points(text):
+    """Text as a uint32 array of its code points"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+
+def from_code_points(codes):
+    """Inverse of code_points"""
+    return np.asarray(codes, dtype='<u4').tobytes().decode('utf-32-le')
+
+
+def pair_letters(codes, filler=FILLER):
+    """
+    Split prepared letters into Playfair pairs in linear time
+    A letter followed by the same letter, or a last unpaired letter, is paired with filler.
+    Returns (pairs as an (m, 2) array, whether each pair was padded, index of each pair's first letter)
+    """
+    n = len(codes)
+    positions = np.arange(n)
+    same = np.zeros(n, dtype=bool)
+    same[:-1] = codes[:-1] == codes[1:]
+    # A pair starts after the second letter of a pair or after a padded letter, so
+    # starts alternate between doubled letters and restart right after each one
+    restart = np.zeros(n, dtype=bool)
+    restart[:1] = True
+    restart[1:] = same[:-1]
+    last_restart = np.maximum.accumulate(np.where(restart, positions, 0))
+    starts = np.flatnonzero((positions - last_restart) % 2 == 0)
+
+    padded = same[starts] | (starts == n - 1)
+    pairs = np.empty((len(starts), 2), dtype=codes.dtype)
+    pairs[:, 0] = codes[starts]
+    pairs[:, 1] = np.where(padded, filler, codes[np.minimum(starts + 1, n - 1)])
+    return pairs, padded, starts
+
+
+def padding_mask(codes, filler=FILLER, first_dropped=False):
+    """
+    Which letters are padding: a filler between two equal letters
+    Of consecutive droppable fillers (e.g. in 'XXXXX') every other one is dropped,
+    as a left-to-right scan that skips each removed filler would. The first and
+    last letters are never dropped; when streaming, codes[0] can be the last
+    letter of the previous chunk and first_dropped says whether it was dropped.
+    """
+    n = len(codes)
+    positions = np.arange(n)
+    droppable = np.zeros(n, dtype=bool)
+    droppable[1:-1] = (codes[1:-1] == filler) & (codes[:-2] == codes[2:])
+    droppable[:1] = first_dropped
+    run_start = droppable.copy()
+    run_start[1:] &= ~droppable[:-1]
+    last_run_start = np.maximum.accumulate(np.where(run_start, positions, 0))
+    return droppable & ((positions - last_run_start) % 2 == 0)
+
+
+def remove_padding(codes, filler=FILLER):
+    """Drop a trailing filler and fillers between two equal letters, in linear time"""
+    if len(codes) and codes[-1] == filler:
+        codes = codes[:-1]
+    return codes[~padding_mask(codes, filler)]
+
+
+class PlayfairTracer:
+    """
+    Receives every step of a Playfair run
+    All hooks do nothing; subclass and override the ones you need (see PrintTracer)
+    mode is 'encrypt' or 'decrypt'; positions are (row, col) tuples
+    """
+    
+    def matrix_created(self, key, key_chars, remaining_chars, all_chars, matrix):
+        pass
+    
+    def encrypt_started(self, plaintext, prepared_text):
+        pass
+    
+    def decrypt_started(self, ciphertext, pairs):
+        pass
+    
+    def pairs_started(self, text):
+        pass
+    
+    def pair_created(self, kind, chars, pair):
+        """kind: 'single' (padded at the end), 'double' (split with X) or 'normal'"""
+        pass
+    
+    def pairs_created(self, pairs):
+        pass
+    
+    def steps_started(self, mode):
+        pass
+    
+    def step_started(self, number, pair):
+        pass
+    
+    def positions_found(self, char1, pos1, char2, pos2):
+        pass
+    
+    def rule_applied(self, mode, rule, pair, result, old_positions, new_positions):
+        """rule: 'row', 'column' or 'rectangle'"""
+        pass
+    
+    def pair_done(self, mode, pair, result):
+        pass
+    
+    def finished(self, mode, result):
+        pass
+
+
+class PrintTracer(PlayfairTracer):
+    """Narrates every step to stdout (the cipher's original step-by-step output)"""
+    
+    MOVES = {('encrypt', 'row'): 'right', ('encrypt', 'column'): 'down',
+             ('decrypt', 'row'): 'left', ('decrypt', 'column'): 'up'}
+    
+    def matrix_created(self, key, key_chars, remaining_chars, all_chars, matrix):
+        print(f"\n🔑 Creating Playfair Matrix from key: '{key}'")
+        print("=" * 50)
+        print(f"📝 Key characters (duplicates removed): {key_chars}")
+        print(f"📝 Remaining alphabet characters: {remaining_chars}")
+        print(f"📝 Final character sequence: {all_chars}")
+        print(f"\n📋 Playfair Matrix:")
+        self._print_matrix(matrix)
+    
+    def _print_matrix(self, matrix):
+        """Pretty print the matrix"""
+        print("    0   1   2   3   4")
+        print("  ┌───┬───┬───┬───┬───┐")
+        for i, row in enumerate(matrix):
+            print(f"{i} │ {' │ '.join(row)} │")
+            if i < 4:
+                print("  ├───┼───┼───┼───┼───┤")
+        print("  └───┴───┴───┴───┴───┘")
+    
+    def encrypt_started(self, plaintext, prepared_text):
+        print(f"\n🔐 ENCRYPTION PROCESS")
+        print("=" * 60)
+        print(f"Original text: '{plaintext}'")
+        print(f"Prepared text: '{prepared_text}' (uppercase, J->I, no spaces)")
+    
+    def decrypt_started(self, ciphertext, pairs):
+        print(f"\n🔓 DECRYPTION PROCESS")
+        print("=" * 60)
+        print(f"Encrypted text: '{ciphertext}'")
+        print(f"Cipher pairs: {pairs}")
+    
+    def pairs_started(self, text):
+        print(f"\n🔤 Creating character pairs from: '{text}'")
+        print("=" * 50)
+    
+    def pair_created(self, kind, chars, pair):
+        if kind == 'single':
+            print(f"📌 Single character '{chars}' paired with 'X': {pair}")
+        elif kind == 'double':
+            print(f"📌 Double character '{chars}' split with 'X': {pair}")
+        else:
+            print(f"📌 Normal pair: {pair}")
+    
+    def pairs_created(self, pairs):
+        print(f"\n✅ Final pairs: {pairs}")
+    
+    def steps_started(self, mode):
+        print(f"\n🔒 {'Encrypting' if mode == 'encrypt' else 'Decrypting'} each pair:")
+        print("-" * 40)
+    
+    def step_started(self, number, pair):
+        print(f"\nStep {number}: Processing pair '{pair}'")
+    
+    def positions_found(self, char1, pos1, char2, pos2):
+        print(f"📍 Position of '{char1}': row {pos1[0]}, col {pos1[1]}")
+        print(f"📍 Position of '{char2}': row {pos2[0]}, col {pos2[1]}")
+    
+    def rule_applied(self, mode, rule, pair, result, old_positions, new_positions):
+        if rule == 'row':
+            print(f"🔄 Same row rule: move {self.MOVES[mode, rule]}")
+        elif rule == 'column':
+            print(f"🔄 Same column rule: move {self.MOVES[mode, rule]}")
+        else:
+            print(f"🔄 Rectangle rule: swap columns")
+        for char, new_char, (row, col), (new_row, new_col) in zip(pair, result, old_positions, new_positions):
+            if rule == 'column':
+                print(f"   '{char}' -> '{new_char}' (row {row} -> {new_row}, col {col})")
+            else:
+                print(f"   '{char}' -> '{new_char}' (row {row}, col {col} -> col {new_col})")
+    
+    def pair_done(self, mode, pair, result):
+        print(f"✅ Pair '{pair}' {mode}ed to '{result}'")
+        print()
+    
+    def finished(self, mode, result):
+        print(f"\n🎉 FINAL {mode.upper()}ED TEXT: '{result}'")
+
+
 class PlayfairCipher:
-    def __init__(self, key="KEYWORD"):
+    def __init__(self, key="KEYWORD", tracer=None):
+        """
+        key: the keyword the matrix is built from
+        tracer: PlayfairTracer notified of every step (None = quiet, no I/O)
+        """
         self.key = key.upper().replace('J', 'I')  # J and I are treated as same
+        self.tracer = tracer
         self.matrix = self._create_matrix()
         self.position = self._create_position_map()
+        self.letter_index = self._create_letter_index()
+        self.tables = self._create_digraph_tables()
     
     def _create_matrix(self):
         """Create the 5x5 Playfair matrix from the key"""
-        print(f"\n🔑 Creating Playfair Matrix from key: '{self.key}'")
-        print("=" * 50)
-        
         # Remove duplicates while preserving order
         key_chars = []
         seen = set()
@@ -19,17 +221,11 @@ class PlayfairCipher:
                 key_chars.append(char)
                 seen.add(char)
         
-        print(f"📝 Key characters (duplicates removed): {key_chars}")
-        
         # Add remaining alphabet characters
-        alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # No J
-        remaining_chars = [char for char in alphabet if char not in seen]
-        
-        print(f"📝 Remaining alphabet characters: {remaining_chars}")
+        remaining_chars = [char for char in ALPHABET if char not in seen]
         
         # Combine key chars with remaining alphabet
         all_chars = key_chars + remaining_chars
-        print(f"📝 Final character sequence: {all_chars}")
         
         # Create 5x5 matrix
         matrix = []
@@ -37,9 +233,8 @@ class PlayfairCipher:
             row = all_chars[i*5:(i+1)*5]
             matrix.append(row)
         
-        print(f"\n📋 Playfair Matrix:")
-        self._print_matrix(matrix)
-        
+        if self.tracer is not None:
+            self.tracer.matrix_created(self.key, key_chars, remaining_chars, all_chars, matrix)
         return matrix
     
     def _create_position_map(self):
@@ -50,15 +245,34 @@ class PlayfairCipher:
                 position[self.matrix[i][j]] = (i, j)
         return position
     
-    def _print_matrix(self, matrix):
-        """Pretty print the matrix"""
-        print("    0   1   2   3   4")
-        print("  ┌───┬───┬───┬───┬───┐")
-        for i, row in enumerate(matrix):
-            print(f"{i} │ {' │ '.join(row)} │")
-            if i < 4:
-                print("  ├───┼───┼───┼───┼───┤")
-        print("  └───┴───┴───┴───┴───┘")
+    def _create_letter_index(self):
+        """
+        Code point -> matrix slot (row * 5 + column), 255 for letters not in the matrix
+        The matrix holds whatever letters the key has, not only ALPHABET (e.g. 'É'),
+        so the lookup covers every code point up to the largest one in the matrix;
+        its last entry is always 255 and stands in for any larger code point.
+        """
+        codes = code_points(''.join(''.join(row) for row in self.matrix))
+        index = np.full(max(256, int(codes.max()) + 2), 255, dtype=np.uint8)
+        index[codes] = np.arange(len(codes))
+        return index
+    
+    def _create_digraph_tables(self):
+        """
+        Encrypt/decrypt result of every one of the 25x25 letter pairs
+        Returns {'encrypt': table, 'decrypt': table}: (25, 25, 2) arrays of
+        code points, indexed by the matrix slot of each letter of the pair
+        """
+        tables = {}
+        for mode, shift in [('encrypt', 1), ('decrypt', -1)]:
+            table = np.empty((25, 25, 2), dtype='<u4')
+            for pos1 in self.position.values():
+                for pos2 in self.position.values():
+                    _, new_pos1, new_pos2 = self._apply_rule(pos1, pos2, shift)
+                    table[pos1[0] * 5 + pos1[1], pos2[0] * 5 + pos2[1]] = (
+                        ord(self.matrix[new_pos1[0]][new_pos1[1]]), ord(self.matrix[new_pos2[0]][new_pos2[1]]))
+            tables[mode] = table
+        return tables
     
     def _prepare_text(self, text):
         """Clean and prepare text for encryption/decryption"""
@@ -69,199 +283,151 @@ class PlayfairCipher:
     
     def _create_pairs(self, text):
         """Create pairs of characters for processing"""
-        print(f"\n🔤 Creating character pairs from: '{text}'")
-        print("=" * 50)
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.pairs_started(text)
         
-        pairs = []
-        i = 0
-        while i < len(text):
-            if i == len(text) - 1:
-                # Last character, pair with X
-                pairs.append(text[i] + 'X')
-                print(f"📌 Single character '{text[i]}' paired with 'X': {text[i]}X")
-                i += 1
-            elif text[i] == text[i + 1]:
-                # Same characters, insert X between them
-                pairs.append(text[i] + 'X')
-                print(f"📌 Double character '{text[i]}{text[i+1]}' split with 'X': {text[i]}X")
-                i += 1
-            else:
-                # Normal pair
-                pair = text[i] + text[i + 1]
-                pairs.append(pair)
-                print(f"📌 Normal pair: {pair}")
-                i += 2
+        pair_codes, padded, starts = pair_letters(code_points(text))
+        joined = from_code_points(pair_codes.ravel())
+        pairs = [joined[i:i+2] for i in range(0, len(joined), 2)]
         
-        print(f"\n✅ Final pairs: {pairs}")
+        if tracer is not None:
+            for pair, is_padded, start in zip(pairs, padded, starts):
+                if not is_padded:
+                    tracer.pair_created('normal', pair, pair)
+                elif start == len(text) - 1:
+                    # Last character, paired with X
+                    tracer.pair_created('single', text[start], pair)
+                else:
+                    # Same characters, split with X
+                    tracer.pair_created('double', text[start:start + 2], pair)
+            tracer.pairs_created(pairs)
         return pairs
     
     def _find_positions(self, char1, char2):
         """Find positions of two characters in the matrix"""
         pos1 = self.position[char1]
         pos2 = self.position[char2]
-        print(f"📍 Position of '{char1}': row {pos1[0]}, col {pos1[1]}")
-        print(f"📍 Position of '{char2}': row {pos2[0]}, col {pos2[1]}")
+        if self.tracer is not None:
+            self.tracer.positions_found(char1, pos1, char2, pos2)
         return pos1, pos2
     
-    def _encrypt_pair(self, pair):
-        """Encrypt a single pair of characters"""
-        char1, char2 = pair[0], pair[1]
-        pos1, pos2 = self._find_positions(char1, char2)
-        
+    @staticmethod
+    def _apply_rule(pos1, pos2, shift):
+        """(rule, new position 1, new position 2) for a pair at pos1/pos2; shift is +1 to encrypt, -1 to decrypt"""
         row1, col1 = pos1
         row2, col2 = pos2
         
         if row1 == row2:
-            # Same row - move right (wrap around)
-            new_col1 = (col1 + 1) % 5
-            new_col2 = (col2 + 1) % 5
-            encrypted_char1 = self.matrix[row1][new_col1]
-            encrypted_char2 = self.matrix[row2][new_col2]
-            print(f"🔄 Same row rule: move right")
-            print(f"   '{char1}' -> '{encrypted_char1}' (row {row1}, col {col1} -> col {new_col1})")
-            print(f"   '{char2}' -> '{encrypted_char2}' (row {row2}, col {col2} -> col {new_col2})")
-            
+            # Same row - move right/left (wrap around)
+            rule = 'row'
+            new_pos1, new_pos2 = (row1, (col1 + shift) % 5), (row2, (col2 + shift) % 5)
         elif col1 == col2:
-            # Same column - move down (wrap around)
-            new_row1 = (row1 + 1) % 5
-            new_row2 = (row2 + 1) % 5
-            encrypted_char1 = self.matrix[new_row1][col1]
-            encrypted_char2 = self.matrix[new_row2][col2]
-            print(f"🔄 Same column rule: move down")
-            print(f"   '{char1}' -> '{encrypted_char1}' (row {row1} -> {new_row1}, col {col1})")
-            print(f"   '{char2}' -> '{encrypted_char2}' (row {row2} -> {new_row2}, col {col2})")
-            
+            # Same column - move down/up (wrap around)
+            rule = 'column'
+            new_pos1, new_pos2 = ((row1 + shift) % 5, col1), ((row2 + shift) % 5, col2)
         else:
             # Rectangle rule - swap columns
-            encrypted_char1 = self.matrix[row1][col2]
-            encrypted_char2 = self.matrix[row2][col1]
-            print(f"🔄 Rectangle rule: swap columns")
-            print(f"   '{char1}' -> '{encrypted_char1}' (row {row1}, col {col1} -> col {col2})")
-            print(f"   '{char2}' -> '{encrypted_char2}' (row {row2}, col {col2} -> col {col1})")
-        
-        encrypted_pair = encrypted_char1 + encrypted_char2
-        print(f"✅ Pair '{pair}' encrypted to '{encrypted_pair}'")
-        return encrypted_pair
+            rule = 'rectangle'
+            new_pos1, new_pos2 = (row1, col2), (row2, col1)
+        return rule, new_pos1, new_pos2
+    
+    def _transform_pair(self, pair, mode):
+        """Encrypt or decrypt a single pair of characters"""
+        pos1, pos2 = self._find_positions(pair[0], pair[1])
+        rule, new_pos1, new_pos2 = self._apply_rule(pos1, pos2, 1 if mode == 'encrypt' else -1)
+        result = self.matrix[new_pos1[0]][new_pos1[1]] + self.matrix[new_pos2[0]][new_pos2[1]]
+        if self.tracer is not None:
+            self.tracer.rule_applied(mode, rule, pair, result, (pos1, pos2), (new_pos1, new_pos2))
+            self.tracer.pair_done(mode, pair, result)
+        return result
+    
+    def _encrypt_pair(self, pair):
+        """Encrypt a single pair of characters"""
+        return self._transform_pair(pair, 'encrypt')
     
     def _decrypt_pair(self, pair):
         """Decrypt a single pair of characters"""
-        char1, char2 = pair[0], pair[1]
-        pos1, pos2 = self._find_positions(char1, char2)
-        
-        row1, col1 = pos1
-        row2, col2 = pos2
-        
-        if row1 == row2:
-            # Same row - move left (wrap around)
-            new_col1 = (col1 - 1) % 5
-            new_col2 = (col2 - 1) % 5
-            decrypted_char1 = self.matrix[row1][new_col1]
-            decrypted_char2 = self.matrix[row2][new_col2]
-            print(f"🔄 Same row rule: move left")
-            print(f"   '{char1}' -> '{decrypted_char1}' (row {row1}, col {col1} -> col {new_col1})")
-            print(f"   '{char2}' -> '{decrypted_char2}' (row {row2}, col {col2} -> col {new_col2})")
-            
-        elif col1 == col2:
-            # Same column - move up (wrap around)
-            new_row1 = (row1 - 1) % 5
-            new_row2 = (row2 - 1) % 5
-            decrypted_char1 = self.matrix[new_row1][col1]
-            decrypted_char2 = self.matrix[new_row2][col2]
-            print(f"🔄 Same column rule: move up")
-            print(f"   '{char1}' -> '{decrypted_char1}' (row {row1} -> {new_row1}, col {col1})")
-            print(f"   '{char2}' -> '{decrypted_char2}' (row {row2} -> {new_row2}, col {col2})")
-            
-        else:
-            # Rectangle rule - swap columns
-            decrypted_char1 = self.matrix[row1][col2]
-            decrypted_char2 = self.matrix[row2][col1]
-            print(f"🔄 Rectangle rule: swap columns")
-            print(f"   '{char1}' -> '{decrypted_char1}' (row {row1}, col {col1} -> col {col2})")
-            print(f"   '{char2}' -> '{decrypted_char2}' (row {row2}, col {col2} -> col {col1})")
+        return self._transform_pair(pair, 'decrypt')
+    
+    def _transform_pairs(self, pairs, mode):
+        """Run every pair through _transform_pair, reporting each step to the tracer"""
+        tracer = self.tracer
+        if tracer is None:
+            return [self._transform_pair(pair, mode) for pair in pairs]
         
-        decrypted_pair = decrypted_char1 + decrypted_char2
-        print(f"✅ Pair '{pair}' decrypted to '{decrypted_pair}'")
-        return decrypted_pair
+        tracer.steps_started(mode)
+        results = []
+        for i, pair in enumerate(pairs):
+            tracer.step_started(i + 1, pair)
+            results.append(self._transform_pair(pair, mode))
+        return results
+    
+    def _transform_text(self, text, mode):
+        """
+        Encrypt or decrypt an even-length string of prepared letters in one pass
+        Each pair is a single gather from the digraph table, done for the whole text at once
+        """
+        index = self.letter_index
+        letters = index[np.minimum(code_points(text), len(index) - 1)]
+        invalid = np.flatnonzero(letters == 255)
+        if len(invalid):
+            # Same error as a lookup in the position map
+            raise KeyError(text[invalid[0]])
+        if len(letters) % 2:
+            raise ValueError(f"❌ Text must have an even number of letters, got {len(letters)}")
+        pairs = letters.reshape(-1, 2)
+        return from_code_points(self.tables[mode][pairs[:, 0], pairs[:, 1]])
     
     def encrypt(self, plaintext):
         """Encrypt the plaintext using Playfair cipher"""
-        print(f"\n🔐 ENCRYPTION PROCESS")
-        print("=" * 60)
-        print(f"Original text: '{plaintext}'")
-        
         # Prepare text
         prepared_text = self._prepare_text(plaintext)
-        print(f"Prepared text: '{prepared_text}' (uppercase, J->I, no spaces)")
-        
-        # Create pairs
-        pairs = self._create_pairs(prepared_text)
-        
-        # Encrypt each pair
-        encrypted_pairs = []
-        print(f"\n🔒 Encrypting each pair:")
-        print("-" * 40)
+        if self.tracer is not None:
+            self.tracer.encrypt_started(plaintext, prepared_text)
         
-        for i, pair in enumerate(pairs):
-            print(f"\nStep {i + 1}: Processing pair '{pair}'")
-            encrypted_pair = self._encrypt_pair(pair)
-            encrypted_pairs.append(encrypted_pair)
-            print()
-        
-        ciphertext = ''.join(encrypted_pairs)
-        print(f"\n🎉 FINAL ENCRYPTED TEXT: '{ciphertext}'")
+        if self.tracer is None:
+            # Pair up and encrypt the whole text with array operations
+            pairs, _, _ = pair_letters(code_points(prepared_text))
+            ciphertext = self._transform_text(from_code_points(pairs.ravel()), 'encrypt')
+        else:
+            # Create pairs
+            pairs = self._create_pairs(prepared_text)
+            
+            # Encrypt each pair
+            ciphertext = ''.join(self._transform_pairs(pairs, 'encrypt'))
+        if self.tracer is not None:
+            self.tracer.finished('encrypt', ciphertext)
         return ciphertext
     
     def decrypt(self, ciphertext):
         """Decrypt the ciphertext using Playfair cipher"""
-        print(f"\n🔓 DECRYPTION PROCESS")
-        print("=" * 60)
-        print(f"Encrypted text: '{ciphertext}'")
-        
         # Prepare text
         prepared_text = self._prepare_text(ciphertext)
         
-        # Create pairs (ciphertext should already be in pairs)
-        pairs = [prepared_text[i:i+2] for i in range(0, len(prepared_text), 2)]
-        print(f"Cipher pairs: {pairs}")
-        
-        # Decrypt each pair
-        decrypted_pairs = []
-        print(f"\n🔒 Decrypting each pair:")
-        print("-" * 40)
-        
-        for i, pair in enumerate(pairs):
-            print(f"\nStep {i + 1}: Processing pair '{pair}'")
-            decrypted_pair = self._decrypt_pair(pair)
-            decrypted_pairs.append(decrypted_pair)
-            print()
-        
-        plaintext = ''.join(decrypted_pairs)
+        if self.tracer is None:
+            # Ciphertext is already in pairs: decrypt them all with table lookups
+            plaintext = self._transform_text(prepared_text, 'decrypt')
+        else:
+            # Create pairs (ciphertext should already be in pairs)
+            pairs = [prepared_text[i:i+2] for i in range(0, len(prepared_text), 2)]
+            self.tracer.decrypt_started(ciphertext, pairs)
+            
+            # Decrypt each pair
+            plaintext = ''.join(self._transform_pairs(pairs, 'decrypt'))
         
         # Clean up the result (remove padding X's if they were added)
         cleaned_plaintext = self._clean_decrypted_text(plaintext)
         
-        print(f"\n🎉 FINAL DECRYPTED TEXT: '{cleaned_plaintext}'")
+        if self.tracer is not None:
+            self.tracer.finished('decrypt', cleaned_plaintext)
         return cleaned_plaintext
     
     def _clean_decrypted_text(self, text):
         """Remove padding X characters from decrypted text"""
         # This is a simple cleanup - in practice, you might need more sophisticated logic
-        # Remove trailing X
-        if text.endswith('X'):
-            text = text[:-1]
-        
-        # Remove X between duplicate characters (this is more complex in real scenarios)
-        cleaned = ""
-        i = 0
-        while i < len(text):
-            if i < len(text) - 2 and text[i] == text[i + 2] and text[i + 1] == 'X':
-                cleaned += text[i]
-                i += 2
-            else:
-                cleaned += text[i]
-                i += 1
-        
-        return cleaned
+        # Remove trailing X and X between duplicate characters (this is more complex in real scenarios)
+        return from_code_points(remove_padding(code_points(text)))
 
 
 def main():
@@ -269,9 +435,9 @@ def main():
     print("🎯 PLAYFAIR CIPHER DEMONSTRATION")
     print("=" * 80)
     
-    # Initialize cipher with a key
+    # Initialize cipher with a key; the tracer narrates every step
     key = "PLAYFAIRKEY"
-    cipher = PlayfairCipher(key)
+    cipher = PlayfairCipher(key, tracer=PrintTracer())
     
     # Test message
     message = "HELLO WORLD"
@@ -1,8 +1,45 @@
+import numpy as np
+
+def key_shifts(key, mode):
+    """Per key letter, the number added mod 26 to a letter ('encrypt': key value, 'decrypt': its negation)"""
+    shifts = (np.frombuffer(key.encode('utf-32-le'), dtype='<u4').astype(np.int64) - ord('A')) % 26
+    if mode == 'decrypt':
+        shifts = (26 - shifts) % 26
+    return shifts.astype(np.uint8)
+
+
+def letter_codes(text):
+    """Letters of text, upper-cased and reduced to 'A'-'Z' as the per-character math does, as a uint8 array"""
+    if text.isascii():
+        # Clearing bit 5 upper-cases a-z and sends every other byte outside 'A'-'Z'
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8) & np.uint8(0xDF)
+        keep = (codes - np.uint8(ord('A'))) < 26
+        return codes if keep.all() else codes[keep]
+    letters = ''.join(filter(str.isalpha, text.upper()))
+    codes = np.frombuffer(letters.encode('utf-32-le'), dtype='<u4').astype(np.int64)
+    return ((codes - ord('A')) % 26 + ord('A')).astype(np.uint8)
+
+
+def shift_letters(text, shifts, offset=0):
+    """
+    Vigenère-shift every letter of text in a few array operations
+    shifts: key_shifts() of the key; offset: key position of the first letter
+    Same result as the character-by-character encrypt/decrypt
+    """
+    codes = letter_codes(text)
+    key = np.tile(np.roll(shifts, -offset), -(-len(codes) // len(shifts)))[:len(codes)]
+    shifted = codes + key
+    shifted -= (shifted > ord('Z')).view(np.uint8) * np.uint8(26)
+    return shifted.tobytes().decode('ascii')
+
+
 class VigenereCipher:
-    def __init__(self, key="KEY"):
+    def __init__(self, key="KEY", verbose=True):
         """
         Initialize Vigenère Cipher with a key
         key: string key for encryption/decryption
+        verbose: print the key values, the Vigenère table and every step of encrypt/decrypt
+                 (quiet runs use the vectorized shift_letters)
         """
         self.key = key.upper().replace(' ', '')
         self.key = ''.join(c for c in self.key if c.isalpha())  # Keep only letters
@@ -10,6 +47,11 @@ class VigenereCipher:
         if not self.key:
             raise ValueError("❌ Key must contain at least one alphabetic character")
         
+        self.verbose = verbose
+        self.shifts = {mode: key_shifts(self.key, mode) for mode in ['encrypt', 'decrypt']}
+        if not verbose:
+            return
+        
         print(f"🔑 Vigenère Cipher initialized with key: '{self.key}'")
         print(f"📏 Key length: {len(self.key)} characters")
         
@@ -141,6 +183,9 @@ class VigenereCipher:
     
     def encrypt(self, plaintext):
         """Encrypt plaintext using Vigenère cipher"""
+        if not self.verbose:
+            return shift_letters(plaintext, self.shifts['encrypt'])
+        
         print(f"\n🔐 VIGENÈRE CIPHER ENCRYPTION")
         print("=" * 70)
         print(f"📨 Original plaintext: '{plaintext}'")
@@ -182,6 +227,9 @@ class VigenereCipher:
     
     def decrypt(self, ciphertext):
         """Decrypt ciphertext using Vigenère cipher"""
+        if not self.verbose:
+            return shift_letters(ciphertext, self.shifts['decrypt'])
+        
         print(f"\n🔓 VIGENÈRE CIPHER DECRYPTION")
         print("=" * 70)
         print(f"🔒 Ciphertext: '{ciphertext}'")
@@ -0,0 +1,331 @@
+import argparse
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from threadpoolctl import threadpool_limits
+
+from model_registry import FEATURE_COLUMNS, load_model_and_scaler
+
+SCORE_COLUMN = 'predicted_score'
+
+
+def _is_parquet(path):
+    return path.endswith(('.parquet', '.pq'))
+
+
+def _is_arrow(path):
+    return path.endswith('.arrow')
+
+
+def iter_chunks(path, chunksize=50000):
+    """Yield DataFrame chunks of a CSV or Parquet file without loading it whole"""
+    if _is_parquet(path):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def _feature_block(df):
+    """The 8 feature columns of df as a float64 (rows, 8) array"""
+    missing = [column for column in FEATURE_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Input is missing feature columns: {missing}")
+    return df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def score_features(features, model, scaler):
+    """Score a (rows, 8) feature array in one scaler.transform / model.predict call"""
+    # Label the columns so the scaler's feature-name check passes (no copy is made)
+    scaled = scaler.transform(pd.DataFrame(features, columns=FEATURE_COLUMNS, copy=False))
+    return np.asarray(model.predict(scaled), dtype=float)
+
+
+def score_frame(df, model, scaler):
+    """Score every row of df in one scaler.transform / model.predict call"""
+    return score_features(_feature_block(df), model, scaler)
+
+
+def _widen_type(a, b):
+    """Narrowest Arrow type both a and b convert to without loss"""
+    if a == b or pa.types.is_null(b):
+        return a
+    if pa.types.is_null(a):
+        return b
+    if pa.types.is_integer(a) and pa.types.is_integer(b):
+        return pa.int64()
+    if (pa.types.is_integer(a) or pa.types.is_floating(a)) and (pa.types.is_integer(b) or pa.types.is_floating(b)):
+        return pa.float64()
+    return pa.string()
+
+
+def _widen_schema(schema, other):
+    """schema with every column widened to also hold other's values"""
+    types = {field.name: field.type for field in other}
+    return pa.schema([pa.field(field.name, _widen_type(field.type, types.get(field.name, field.type)))
+                      for field in schema])
+
+
+class _ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file as they are produced"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._wrote_header = False
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            self.write_table(pa.Table.from_pandas(df, preserve_index=False))
+        else:
+            df.to_csv(self.path, mode='a' if self._wrote_header else 'w', header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def write_table(self, table):
+        """Append an Arrow table to the Parquet output"""
+        # Chunks are typed independently (e.g. a text column that is empty in the
+        # first CSV chunk reads as float64), so the file schema widens as needed
+        table = table.replace_schema_metadata(None)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        elif not table.schema.equals(self._parquet.schema):
+            schema = _widen_schema(self._parquet.schema, table.schema)
+            if not schema.equals(self._parquet.schema):
+                self._rewrite(schema)
+            table = table.cast(schema)
+        self._parquet.write_table(table)
+
+    def _rewrite(self, schema):
+        """Reopen the output with a wider schema, carrying over the row groups written so far"""
+        self._parquet.close()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                        prefix=f"{os.path.basename(self.path)}.", suffix='.tmp')
+        os.close(fd)
+        os.replace(self.path, tmp_path)
+        try:
+            self._parquet = pq.ParquetWriter(self.path, schema)
+            with pq.ParquetFile(tmp_path) as written:
+                for i in range(written.num_row_groups):
+                    self._parquet.write_table(written.read_row_group(i).cast(schema))
+        finally:
+            os.remove(tmp_path)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def predict_batch(input_path, output_path, chunksize=50000, model_name='model.pkl', scaler_name='scaler.pkl'):
+    """
+    Stream a table of candidate sites through the model
+    Every input column is kept and the score is appended as 'predicted_score'.
+    Returns the number of rows scored.
+    """
+    model, scaler = load_model_and_scaler(model_name, scaler_name)
+    writer = _ChunkWriter(output_path)
+    rows = 0
+    try:
+        for chunk in iter_chunks(input_path, chunksize):
+            chunk[SCORE_COLUMN] = score_frame(chunk, model, scaler)
+            writer.write(chunk)
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+# Per-worker state, set once by _init_worker in each pool process
+_worker = {}
+
+# Most bytes of CSV input per parallel task; bounds each worker's read buffer
+PART_BYTES = 64 << 20
+# Parallel tasks per worker, so uneven parts still keep every worker busy
+PARTS_PER_WORKER = 4
+# Bytes per block when counting quotes in a CSV
+_SCAN_BYTES = 16 << 20
+
+
+def _count_quotes(data, start, stop):
+    """Number of '"' bytes in data[start:stop], scanned in blocks"""
+    return sum(int(np.count_nonzero(data[i:min(i + _SCAN_BYTES, stop)] == ord('"')))
+               for i in range(start, stop, _SCAN_BYTES))
+
+
+def _record_end(mm, data, start, target):
+    """
+    First record boundary at or after target in a CSV mapped as mm/data, given that start is one
+    A newline ends a record when the quotes since start are balanced, so newlines
+    inside quoted fields never split a row (doubled "" escapes keep the count even)
+    """
+    quotes = _count_quotes(data, start, target)
+    position = target
+    while True:
+        newline = mm.find(b'\n', position)
+        if newline == -1:
+            return len(mm)
+        quotes += _count_quotes(data, position, newline)
+        if quotes % 2 == 0:
+            return newline + 1
+        position = newline + 1
+
+
+def csv_parts(path, part_bytes=PART_BYTES):
+    """(header bytes, [(start, stop), ...]) byte ranges of whole CSV records, about part_bytes each"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b'', []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                header_end = _record_end(mm, data, 0, 0)
+                bounds = [header_end]
+                for target in range(header_end + part_bytes, len(mm), part_bytes):
+                    if target > bounds[-1]:
+                        bounds.append(_record_end(mm, data, bounds[-1], target))
+                if bounds[-1] < len(mm):
+                    bounds.append(len(mm))
+                header = mm[:header_end]
+            finally:
+                del data  # release the buffer before the map closes
+    return header, [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _init_worker(model_name, scaler_name, input_path, header, chunksize):
+    """Load the model once per worker"""
+    # One BLAS thread per process, otherwise N workers oversubscribe the cores
+    _worker['limits'] = threadpool_limits(limits=1)
+    _worker['model'], _worker['scaler'] = load_model_and_scaler(model_name, scaler_name)
+    _worker['input'], _worker['header'], _worker['chunksize'] = input_path, header, chunksize
+
+
+def _part_chunks(part):
+    """DataFrame chunks of one part of the input: a CSV byte range or a Parquet row group"""
+    path, chunksize = _worker['input'], _worker['chunksize']
+    if _is_parquet(path):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, row_groups=[part]):
+            yield batch.to_pandas()
+    else:
+        start, stop = part
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = _worker['header'] + f.read(stop - start)
+        yield from pd.read_csv(io.BytesIO(data), chunksize=chunksize)
+
+
+def _score_part(part, part_path):
+    """
+    Parse, score and write one part of the input; return its row count
+    Parts of a Parquet output are Arrow IPC files, so the parent encodes the
+    output once instead of decoding and re-encoding Parquet parts
+    """
+    rows, tables = 0, []
+    writer = None if _is_arrow(part_path) else _ChunkWriter(part_path)
+    try:
+        for chunk in _part_chunks(part):
+            chunk[SCORE_COLUMN] = score_frame(chunk, _worker['model'], _worker['scaler'])
+            rows += len(chunk)
+            if writer is None:
+                tables.append(pa.Table.from_pandas(chunk, preserve_index=False).replace_schema_metadata(None))
+            else:
+                writer.write(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if tables:
+        schema = tables[0].schema
+        for table in tables[1:]:
+            schema = _widen_schema(schema, table.schema)
+        with pa.ipc.new_file(part_path, schema) as ipc:
+            for table in tables:
+                ipc.write_table(table.cast(schema))
+    return rows
+
+
+def _concat_parts(part_paths, output_path):
+    """Join the workers' part files, in input order, into the output"""
+    part_paths = [path for path in part_paths if os.path.exists(path)]
+    if _is_parquet(output_path):
+        writer = _ChunkWriter(output_path)
+        try:
+            for path in part_paths:
+                with pa.memory_map(path) as source:
+                    part = pa.ipc.open_file(source)
+                    for i in range(part.num_record_batches):
+                        writer.write_table(pa.Table.from_batches([part.get_batch(i)]))
+        finally:
+            writer.close()
+        return
+    # CSV parts are byte-concatenated, keeping only the first part's header
+    with open(output_path, 'wb') as out:
+        for i, path in enumerate(part_paths):
+            with open(path, 'rb') as part:
+                if i:
+                    part.readline()
+                shutil.copyfileobj(part, out, 16 << 20)
+
+
+def predict_parallel(input_path, output_path, workers=None, chunksize=50000, part_bytes=None,
+                     model_name='model.pkl', scaler_name='scaler.pkl'):
+    """
+    Score a large table across a process pool
+    Every worker parses its own part of the input, scores it and writes a part
+    file, so parsing scales with the workers too; the parent only finds the
+    parts and joins the results (byte copies for CSV, one encoding pass for
+    Parquet). Parts are CSV byte ranges of about part_bytes, split between
+    records, or Parquet row groups (a Parquet file with fewer row groups than
+    workers cannot use them all). part_bytes defaults to PARTS_PER_WORKER parts
+    per worker, at most PART_BYTES each.
+    Returns the number of rows scored.
+    """
+    workers = workers or os.cpu_count()
+    model_name, scaler_name = os.path.abspath(model_name), os.path.abspath(scaler_name)
+    if _is_parquet(input_path):
+        header, parts = b'', list(range(pq.ParquetFile(input_path).num_row_groups))
+    else:
+        if part_bytes is None:
+            size = os.path.getsize(input_path)
+            part_bytes = min(PART_BYTES, max(1 << 20, size // (workers * PARTS_PER_WORKER)))
+        header, parts = csv_parts(input_path, part_bytes)
+    if not parts:
+        return predict_batch(input_path, output_path, chunksize, model_name, scaler_name)
+
+    extension = '.arrow' if _is_parquet(output_path) else '.csv'
+    with tempfile.TemporaryDirectory(prefix='spotperfect-') as tmp_dir:
+        part_paths = [os.path.join(tmp_dir, f"{i:06d}{extension}") for i in range(len(parts))]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_name, scaler_name, input_path, header, chunksize)) as pool:
+            rows = sum(pool.map(_score_part, parts, part_paths))
+        _concat_parts(part_paths, output_path)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet table of candidate sites with the SpotPerfect model")
+    parser.add_argument('input', help="CSV or Parquet file with the 8 feature columns")
+    parser.add_argument('output', help="CSV or Parquet file to write (format from the extension)")
+    parser.add_argument('--chunksize', type=int, default=50000, help="rows scored per block")
+    parser.add_argument('--model', default='model.pkl', help="pickled model")
+    parser.add_argument('--scaler', default='scaler.pkl', help="pickled scaler")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (0 = all cores)")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("output must differ from input")
+    if args.workers == 1:
+        rows = predict_batch(args.input, args.output, args.chunksize, args.model, args.scaler)
+    else:
+        rows = predict_parallel(args.input, args.output, args.workers or None, args.chunksize,
+                                model_name=args.model, scaler_name=args.scaler)
+    print(f"✅ Scored {rows} rows into '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
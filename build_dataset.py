@@ -0,0 +1,135 @@
+import argparse
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from location_keys import clean_location, join_coordinates
+from model_registry import get_registry
+from profiling import span
+
+OUTPUT_CSV = 'output.csv'
+COMBINED_CSV = 'combined_data.csv'
+DATASET_PATH = 'locations.parquet'
+
+# Serializes rebuilds, so sessions that all see a stale artifact build it once
+_build_lock = threading.Lock()
+
+# In-memory types of the location table; columns not listed here (e.g. the
+# stale suitability_diff in output.csv) are dropped
+SCHEMA = {
+    'location': 'category',
+    'state': 'category',
+    'location_key': np.int32,
+    'population': np.int32,
+    'dist_road_qual': np.float64,
+    'tier_value': np.int8,
+    'edi': np.float64,
+    'literacy_rate': np.int8,
+    'railways_count': np.int8,
+    'average_land_price': np.float32,
+    'airport_proximity': np.float32,
+    'suitability_score': np.float64,  # kept exact: the score index orders and ties on it
+    'lats': np.float32,
+    'longs': np.float32,
+}
+
+
+def apply_schema(df):
+    """Cast df to SCHEMA, dropping columns outside it"""
+    df = df[[column for column in SCHEMA if column in df.columns]].copy()
+    for column in df.columns:
+        dtype = SCHEMA[column]
+        # Integer columns with gaps or fractions fall back to a float that holds them exactly
+        if dtype != 'category' and np.issubdtype(dtype, np.integer):
+            values = df[column].to_numpy(dtype=float)
+            if np.isnan(values).any() or (values % 1 != 0).any():
+                dtype = np.float32 if np.dtype(dtype).itemsize < 4 else np.float64
+        df[column] = df[column].astype(dtype)
+    return df
+
+
+def write_parquet(df, path):
+    """
+    Write df to path atomically: into a uniquely named file next to it, then rename,
+    so readers never see a partial file and concurrent writers never share a temp file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=f"{os.path.basename(path)}.", suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def state_of(locations):
+    """State part of cleaned 'City, State' names"""
+    return locations.astype(str).str.split(', ', n=1).str[1]
+
+
+def build_dataset(output_csv=OUTPUT_CSV, combined_csv=COMBINED_CSV, dataset_path=DATASET_PATH):
+    """
+    Clean both CSVs, join the coordinates once and write the Parquet artifact
+    Returns (merged table, feature rows that found no coordinates)
+    """
+    with span('csv_read'):
+        output_df = pd.read_csv(output_csv)
+        coords_df = pd.read_csv(combined_csv, usecols=['location', 'lats', 'longs'])
+
+    # Join on integer location keys, then keep the cleaned name for display
+    with span('merge'):
+        merged_df, unmatched = join_coordinates(output_df, coords_df)
+    with span('clean'):
+        merged_df['location'] = clean_location(merged_df['location'])
+        merged_df['state'] = state_of(merged_df['location'])
+        merged_df = apply_schema(merged_df)
+    write_parquet(merged_df, dataset_path)
+    return merged_df, unmatched
+
+
+def _is_stale(dataset_path, sources):
+    """True when the artifact is missing or older than any of its sources"""
+    if not os.path.exists(dataset_path):
+        return True
+    built = os.path.getmtime(dataset_path)
+    return any(os.path.getmtime(src) > built for src in sources)
+
+
+def ensure_dataset(dataset_path=DATASET_PATH, output_csv=OUTPUT_CSV, combined_csv=COMBINED_CSV):
+    """(Re)build the artifact if it is missing or stale; return its absolute path"""
+    sources = [output_csv, combined_csv]
+    if _is_stale(dataset_path, sources):
+        with _build_lock:
+            # Another thread may have rebuilt it while this one waited
+            if _is_stale(dataset_path, sources):
+                build_dataset(output_csv, combined_csv, dataset_path)
+    return os.path.abspath(dataset_path)
+
+
+def load_dataset(dataset_path=DATASET_PATH, output_csv=OUTPUT_CSV, combined_csv=COMBINED_CSV):
+    """Return the shared merged location table (read-only), building the artifact if needed"""
+    return get_registry().get(ensure_dataset(dataset_path, output_csv, combined_csv), loader=pd.read_parquet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-normalized SpotPerfect location dataset")
+    parser.add_argument('--output-csv', default=OUTPUT_CSV, help="city feature table")
+    parser.add_argument('--combined-csv', default=COMBINED_CSV, help="city coordinates table")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="Parquet artifact to write")
+    args = parser.parse_args()
+
+    merged_df, unmatched = build_dataset(args.output_csv, args.combined_csv, args.dataset)
+    print(f"✅ Wrote {len(merged_df)} locations to '{args.dataset}' ({len(unmatched)} without coordinates)")
+    print(f"   In memory: {merged_df.memory_usage(deep=True).sum() / 1024:.1f} KiB")
+    for location in unmatched['location']:
+        print(f"   ⚠️ No coordinates for: '{location}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import io
+
+import altair as alt
+import pandas as pd
+from matplotlib.figure import Figure
+
+
+def _long_form(valid_cities, parameters):
+    """One row per (city, parameter) for faceted charts"""
+    long_df = valid_cities.melt(
+        id_vars=['location', 'classification'],
+        value_vars=list(parameters.values()),
+        var_name='column',
+        value_name='value',
+    )
+    names = {column: name for name, column in parameters.items()}
+    long_df['parameter'] = long_df['column'].map(names)
+    return long_df
+
+
+def comparison_chart(valid_cities, parameters, color_scheme):
+    """
+    Altair spec with one horizontal bar panel per parameter
+    Rendered by the browser, so nothing is rasterized on the server
+    """
+    # Labels outside the scheme (e.g. from a custom rule set) are drawn in gray, as on the map
+    unknown = [label for label in valid_cities['classification'].dropna().unique() if label not in color_scheme]
+    color = alt.Color(
+        'classification:N',
+        title='Classification',
+        scale=alt.Scale(domain=list(color_scheme) + unknown,
+                        range=list(color_scheme.values()) + ['gray'] * len(unknown)),
+    )
+    bars = alt.Chart(_long_form(valid_cities, parameters)).mark_bar(opacity=0.7).encode(
+        x=alt.X('value:Q', title=None),
+        y=alt.Y('location:N', title='Location'),
+        color=color,
+        tooltip=['location:N', 'classification:N', 'parameter:N', 'value:Q'],
+    ).properties(width=380, height=max(120, 22 * len(valid_cities)))
+
+    return bars.facet(
+        facet=alt.Facet('parameter:N', sort=list(parameters), title=None),
+        columns=2,
+    ).resolve_scale(x='independent')
+
+
+def sweep_chart(result, parameters):
+    """
+    Altair spec for a sweep.sweep result: tornado bars of the sensitivities
+    above one score-vs-value panel per parameter
+    """
+    names = {column: name for name, column in parameters.items()}
+    sensitivity = result['sensitivity'].assign(parameter=result['sensitivity']['feature'].map(names))
+    order = list(sensitivity['parameter'])
+
+    tornado = alt.Chart(sensitivity).mark_bar(opacity=0.7).encode(
+        x=alt.X('low_score:Q', title='Predicted score', scale=alt.Scale(zero=False)),
+        x2='high_score:Q',
+        y=alt.Y('parameter:N', sort=order, title=None),
+        tooltip=['parameter:N', 'low_score:Q', 'high_score:Q', 'swing:Q'],
+    ).properties(width=780, height=24 * len(order), title='Score with one input at its minimum / maximum')
+    base = alt.Chart(pd.DataFrame({'score': [result['base_score']]})).mark_rule(color='black').encode(x='score:Q')
+
+    curves = result['curves'].rename(columns={
+        'score': 'This input only',
+        'partial_dependence': 'Averaged over other inputs',
+    }).melt(id_vars=['feature', 'value'], var_name='curve', value_name='predicted_score')
+    curves['parameter'] = curves['feature'].map(names)
+    lines = alt.Chart(curves).mark_line().encode(
+        x=alt.X('value:Q', title=None),
+        y=alt.Y('predicted_score:Q', title='Predicted score', scale=alt.Scale(zero=False)),
+        color=alt.Color('curve:N', title=None),
+        tooltip=['parameter:N', 'curve:N', 'value:Q', 'predicted_score:Q'],
+    ).properties(width=380, height=160).facet(
+        facet=alt.Facet('parameter:N', sort=order, title=None),
+        columns=2,
+    ).resolve_scale(x='independent')
+
+    return alt.vconcat(tornado + base, lines)
+
+
+def comparison_figure(valid_cities, parameters, color_scheme):
+    """
+    PNG bytes of every parameter panel laid out in a single matplotlib figure
+    Uses Figure directly instead of pyplot, so no global figure is left behind
+    """
+    rows = (len(parameters) + 1) // 2
+    fig = Figure(figsize=(16, 4.5 * rows))
+    axes = fig.subplots(rows, 2, squeeze=False).flatten()
+    groups = list(valid_cities.groupby('classification', sort=False))
+
+    for ax, (param_name, param_column) in zip(axes, parameters.items()):
+        for classification, data in groups:
+            ax.barh(data['location'], data[param_column],
+                    label=classification,
+                    color=color_scheme.get(classification, 'gray'),
+                    alpha=0.7)
+        ax.set_title(f'{param_name} Across Top Locations')
+        ax.set_xlabel(param_name)
+        ax.set_ylabel('Location')
+        ax.tick_params(axis='y', labelsize=10)
+        ax.legend()
+    for ax in axes[len(parameters):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
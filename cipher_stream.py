@@ -0,0 +1,249 @@
+import argparse
+import io
+import sys
+
+import numpy as np
+
+from Hill import HillCipher
+from Playcipher import FILLER, PlayfairCipher, code_points, from_code_points, padding_mask, pair_letters
+from Vigenere import VigenereCipher, shift_letters
+
+CHUNK_SIZE = 1 << 20  # characters read per chunk
+CIPHERS = ['playfair', 'hill', 'vigenere']
+MODES = ['encrypt', 'decrypt']
+
+
+class PlayfairStream:
+    def __init__(self, cipher, mode):
+        """
+        Chunked Playfair encryption/decryption with the same output as one
+        cipher.encrypt/decrypt call on the whole text
+        Carries the pending unpaired letter, and when decrypting the last two
+        letters whose padding status depends on what follows.
+        """
+        self.cipher = cipher
+        self.mode = mode
+        self._pending = np.empty(0, dtype='<u4')
+        # Decrypt: last emitted letter (as context) and whether it was padding
+        self._context = np.empty(0, dtype='<u4')
+        self._context_dropped = False
+        self._held = np.empty(0, dtype='<u4')
+
+    def _letters(self, text):
+        return np.concatenate([self._pending, code_points(self.cipher._prepare_text(text))])
+
+    def update(self, text):
+        """Process one chunk; return the output that is final so far"""
+        letters = self._letters(text)
+        if self.mode == 'encrypt':
+            pairs, _, starts = pair_letters(letters)
+            # A last single letter may still pair with the next chunk's first letter
+            if len(starts) and starts[-1] == len(letters) - 1:
+                self._pending, pairs = letters[-1:], pairs[:-1]
+            else:
+                self._pending = letters[:0]
+            return self.cipher._transform_text(from_code_points(pairs.ravel()), 'encrypt')
+
+        even = len(letters) - len(letters) % 2
+        self._pending = letters[even:]
+        plain = code_points(self.cipher._transform_text(from_code_points(letters[:even]), 'decrypt'))
+        return self._strip_padding(plain, final=False)
+
+    def _strip_padding(self, plain, final):
+        """
+        Remove padding from decrypted letters as they arrive
+        A letter is settled once two more follow it: one to compare against,
+        and one more in case that next letter is the trailing filler.
+        """
+        letters = np.concatenate([self._context, self._held, plain])
+        start = len(self._context)
+        if final:
+            if len(letters) > start and letters[-1] == FILLER:
+                letters = letters[:-1]
+            settled = len(letters)
+        else:
+            settled = max(start, len(letters) - 2)
+        dropped = padding_mask(letters, first_dropped=self._context_dropped)
+        if not final:
+            # The last settled letter is only final once its right neighbour is known
+            dropped[settled:] = False
+        output = letters[start:settled][~dropped[start:settled]]
+
+        if settled > start:
+            self._context = letters[settled - 1:settled]
+            self._context_dropped = bool(dropped[settled - 1])
+        self._held = letters[settled:]
+        return from_code_points(output)
+
+    def finish(self):
+        """Flush whatever the end of the input settles"""
+        if self.mode == 'encrypt':
+            pairs, _, _ = pair_letters(self._pending)
+            self._pending = self._pending[:0]
+            return self.cipher._transform_text(from_code_points(pairs.ravel()), 'encrypt')
+        if len(self._pending):
+            raise ValueError("❌ Ciphertext must have an even number of letters")
+        return self._strip_padding(np.empty(0, dtype='<u4'), final=True)
+
+
+class HillStream:
+    def __init__(self, cipher, mode):
+        """
+        Chunked Hill encryption/decryption with the same output as one
+        cipher.encrypt/decrypt call on the whole text
+        Carries a partial block, and when decrypting the run of trailing X's
+        (only dropped if nothing else follows).
+        """
+        self.cipher = cipher
+        self.mode = mode
+        self.matrix = cipher.key_matrix if mode == 'encrypt' else cipher.inv_key_matrix
+        self._pending = np.empty(0, dtype=np.int64)
+        self._trailing_x = 0
+
+    def _numbers(self, text):
+        """Letters of text as numbers (A=0, ..., Z=25), prepared as HillCipher does"""
+        text = text.upper().replace(' ', '').replace('J', 'I')
+        text = ''.join(c for c in text if c.isalpha())
+        return code_points(text).astype(np.int64) - ord('A')
+
+    def _process(self, numbers):
+        """Multiply every complete block by the key (or inverse) matrix"""
+        blocks = numbers.reshape(-1, self.cipher.n)
+        return from_code_points(((blocks @ self.matrix.T) % 26).ravel() + ord('A'))
+
+    def update(self, text):
+        """Process one chunk; return the output that is final so far"""
+        numbers = np.concatenate([self._pending, self._numbers(text)])
+        complete = len(numbers) - len(numbers) % self.cipher.n
+        self._pending = numbers[complete:]
+        output = self._process(numbers[:complete])
+        if self.mode == 'encrypt':
+            return output
+
+        # Hold back trailing X's as a count: they are padding if the text ends here
+        stripped = output.rstrip('X')
+        if not stripped:
+            self._trailing_x += len(output)
+            return ''
+        held, self._trailing_x = self._trailing_x, len(output) - len(stripped)
+        return 'X' * held + stripped
+
+    def finish(self):
+        """Flush whatever the end of the input settles"""
+        if self.mode == 'decrypt':
+            if len(self._pending):
+                raise ValueError(f"❌ Ciphertext length must be a multiple of the key size {self.cipher.n}")
+            return ''
+        if not len(self._pending):
+            return ''
+        # Pad the last block with 'X' (23), as HillCipher._pad_text does
+        padded = np.concatenate([self._pending, np.full(self.cipher.n - len(self._pending), 23)])
+        self._pending = self._pending[:0]
+        return self._process(padded)
+
+
+class VigenereStream:
+    def __init__(self, cipher, mode):
+        """
+        Chunked Vigenère encryption/decryption with the same output as one
+        cipher.encrypt/decrypt call on the whole text
+        Carries the key offset (letters processed so far).
+        """
+        self.cipher = cipher
+        self.shifts = cipher.shifts[mode]
+        self.offset = 0
+
+    def update(self, text):
+        """Process one chunk; return its output"""
+        output = shift_letters(text, self.shifts, self.offset)
+        self.offset = (self.offset + len(output)) % len(self.shifts)
+        return output
+
+    def finish(self):
+        return ''
+
+
+def parse_hill_key(key):
+    """'3,2,5,7' -> [[3, 2], [5, 7]] (a square matrix, row by row)"""
+    values = [int(value) for value in key.replace(';', ',').split(',') if value.strip()]
+    n = int(round(len(values) ** 0.5))
+    if n == 0 or n * n != len(values):
+        raise ValueError(f"❌ Hill key must have a square number of entries, got {len(values)}")
+    return [values[i * n:(i + 1) * n] for i in range(n)]
+
+
+def make_stream(cipher, mode, key):
+    """Stream transformer for a cipher name ('playfair', 'hill', 'vigenere') and mode"""
+    if mode not in MODES:
+        raise ValueError(f"❌ mode must be one of {MODES}, got '{mode}'")
+    if cipher == 'playfair':
+        return PlayfairStream(PlayfairCipher(key), mode)
+    if cipher == 'hill':
+        return HillStream(HillCipher(parse_hill_key(key), verbose=False), mode)
+    if cipher == 'vigenere':
+        return VigenereStream(VigenereCipher(key, verbose=False), mode)
+    raise ValueError(f"❌ cipher must be one of {CIPHERS}, got '{cipher}'")
+
+
+def iter_transform(stream, chunks):
+    """Feed text chunks through a stream transformer, yielding output as it is settled"""
+    for chunk in chunks:
+        output = stream.update(chunk)
+        if output:
+            yield output
+    output = stream.finish()
+    if output:
+        yield output
+
+
+def read_chunks(reader, chunk_size=CHUNK_SIZE):
+    """Yield fixed-size text chunks from a file object"""
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def transform_file(stream, reader, writer, chunk_size=CHUNK_SIZE):
+    """Stream reader through the transformer into writer with bounded memory; return characters written"""
+    written = 0
+    for output in iter_transform(stream, read_chunks(reader, chunk_size)):
+        writer.write(output)
+        written += len(output)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt a file or stdin in fixed-size chunks")
+    parser.add_argument('cipher', choices=CIPHERS)
+    parser.add_argument('mode', choices=MODES)
+    parser.add_argument('--key', required=True, help="keyword, or for hill the matrix row by row ('3,2,5,7')")
+    parser.add_argument('-i', '--input', default=None, help="input file (default: stdin)")
+    parser.add_argument('-o', '--output', default=None, help="output file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="characters read per chunk")
+    args = parser.parse_args()
+
+    try:
+        stream = make_stream(args.cipher, args.mode, args.key)
+    except ValueError as e:
+        parser.error(str(e))
+    # Undecodable bytes become U+FFFD, which is not a letter and is skipped like any other symbol
+    if args.input:
+        reader = open(args.input, encoding='utf-8', errors='replace')
+    else:
+        reader = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    writer = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        written = transform_file(stream, reader, writer, args.chunk_size)
+    finally:
+        if args.input:
+            reader.close()
+        if args.output:
+            writer.close()
+    if args.output:
+        print(f"✅ Wrote {written} characters to '{args.output}'", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
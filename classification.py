@@ -0,0 +1,82 @@
+import numpy as np
+
+CROSS_DOCKING = 'Cross-Docking Center'
+WAREHOUSE = 'Warehouse'
+
+
+def classify_location(row):
+    """Row-wise reference classifier (the original streamlit_app.py rules)"""
+    if (row['population'] > 1000000 and
+        row['dist_road_qual'] > 800000 and
+        row['tier_value'] in [1, 2] and (row['airport_proximity'] > 20 or
+        row['airport_proximity'] < 50) or (row['literacy_rate'] > 7 and row['railways_count'] < 6) and (row['edi'] > 25000 and row['edi'] < 70000) and
+        (row['average_land_price'] > 2000 and row['average_land_price'] < 5000)):
+        return CROSS_DOCKING
+
+    elif((row['population'] > 500000 and row['population'] < 3000000) or
+        row['dist_road_qual'] > 800000 or
+        row['tier_value'] in [2, 3] and (row['airport_proximity'] > 30 and
+        row['airport_proximity'] < 80) and (row['literacy_rate'] > 7 and row['railways_count'] > 5 and row['railways_count'] < 11) and (row['edi'] > 15000 and row['edi'] < 50000) and
+        (row['average_land_price'] > 2000 and row['average_land_price'] < 5000)):
+        return WAREHOUSE
+    else:
+        return CROSS_DOCKING
+
+
+def _between(values, low, high):
+    """Exclusive range check, like `low < x < high` in the row-wise rules"""
+    return (values > low) & (values < high)
+
+
+def classify_locations(df):
+    """
+    Vectorized classify_location over a whole frame
+    Returns a numpy array of labels; `and` binds tighter than `or` exactly as in
+    the row-wise rules, i.e. each condition is an OR of AND-groups
+    """
+    population = df['population'].to_numpy()
+    road = df['dist_road_qual'].to_numpy()
+    tier = df['tier_value']
+    airport = df['airport_proximity'].to_numpy()
+    literacy = df['literacy_rate'].to_numpy()
+    railways = df['railways_count'].to_numpy()
+    edi = df['edi'].to_numpy()
+    land_price = _between(df['average_land_price'].to_numpy(), 2000, 5000)
+
+    cross_docking = (
+        ((population > 1000000) & (road > 800000) & tier.isin([1, 2]).to_numpy() &
+         ((airport > 20) | (airport < 50))) |
+        ((literacy > 7) & (railways < 6) & _between(edi, 25000, 70000) & land_price)
+    )
+    warehouse = (
+        _between(population, 500000, 3000000) |
+        (road > 800000) |
+        (tier.isin([2, 3]).to_numpy() & _between(airport, 30, 80) &
+         (literacy > 7) & _between(railways, 5, 11) & _between(edi, 15000, 50000) & land_price)
+    )
+    return np.select([cross_docking, warehouse], [CROSS_DOCKING, WAREHOUSE], default=CROSS_DOCKING)
+
+
+def check_equivalence(df):
+    """Return the rows where the vectorized and row-wise classifiers disagree"""
+    expected = df.apply(classify_location, axis=1).to_numpy()
+    actual = classify_locations(df)
+    return df[expected != actual]
+
+
+def main():
+    """Check the vectorized classifier against the row-wise one on the dataset"""
+    from build_dataset import load_dataset
+
+    df = load_dataset()
+    mismatches = check_equivalence(df)
+    if mismatches.empty:
+        print(f"✅ Vectorized classification matches row-wise rules on {len(df)} rows")
+    else:
+        print(f"❌ {len(mismatches)} of {len(df)} rows classified differently:")
+        print(mismatches)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
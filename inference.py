@@ -0,0 +1,173 @@
+import argparse
+import threading
+import timeit
+
+import numpy as np
+import pandas as pd
+from sklearn.base import is_regressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from batch_predict import score_features
+from model_registry import FEATURE_COLUMNS, get_registry, load_model_and_scaler
+
+
+def _scaler_params(scaler, n_features):
+    """(mean, scale) of a fitted StandardScaler, with identity values for disabled parts"""
+    if scaler is None:
+        return np.zeros(n_features), np.ones(n_features)
+    mean = scaler.mean_ if scaler.mean_ is not None and scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None and scaler.with_std else np.ones(n_features)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+
+class LinearKernel:
+    def __init__(self, model, scaler=None):
+        """
+        Linear model with the scaler folded into its coefficients
+        coef . (x - mean) / scale + intercept == x . weights + bias
+        """
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim > 1:
+            if coef.shape[0] != 1:
+                raise ValueError(f"❌ Only single-target linear models can be compiled, got {coef.shape[0]} targets")
+            coef = coef[0]
+        mean, scale = _scaler_params(scaler, len(coef))
+        self.weights = coef / scale
+        self.bias = float(np.ravel(model.intercept_)[0]) - float(np.dot(mean / scale, coef))
+
+    def __call__(self, features):
+        """Scores for a (rows, n_features) array"""
+        return np.asarray(features, dtype=np.float64) @ self.weights + self.bias
+
+    def predict_one(self, features):
+        """Score for a single feature vector"""
+        return float(np.dot(np.asarray(features, dtype=np.float64), self.weights)) + self.bias
+
+
+class TreeKernel:
+    def __init__(self, trees, scaler=None, n_features=None):
+        """
+        Decision trees flattened into shared node arrays, walked for all rows and trees at once
+        Inputs are scaled and cast to float32 first, as sklearn does, so every
+        split goes the same way.
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            tree = tree.tree_
+            if tree.value.shape[1] != 1:
+                raise ValueError(f"❌ Only single-target trees can be compiled, got {tree.value.shape[1]} targets")
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+            # Leaves point at themselves, so extra steps past a leaf are harmless
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = max(tree.tree_.max_depth for tree in trees)
+        self.mean, self.scale = _scaler_params(scaler, n_features or trees[0].n_features_in_)
+
+    def __call__(self, features):
+        """Mean of the tree outputs for a (rows, n_features) array"""
+        features = np.asarray(features, dtype=np.float64).reshape(-1, len(self.mean))
+        features = ((features - self.mean) / self.scale).astype(np.float32)
+        rows = np.arange(len(features))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(features), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = features[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        # Sum trees in order, as the forest accumulates them, before averaging
+        return np.cumsum(self.value[nodes], axis=1)[:, -1] / len(self.roots)
+
+    def predict_one(self, features):
+        """Score for a single feature vector"""
+        return float(self(features)[0])
+
+
+def compile_model(model, scaler=None):
+    """
+    Extract the fitted parameters of a model (and its scaler) into a NumPy kernel
+    Supports linear regressors (LinearRegression, Ridge, ...), DecisionTreeRegressor
+    and RandomForestRegressor.
+    """
+    if isinstance(model, RandomForestRegressor):
+        return TreeKernel(model.estimators_, scaler, model.n_features_in_)
+    if isinstance(model, DecisionTreeRegressor):
+        return TreeKernel([model], scaler, model.n_features_in_)
+    if is_regressor(model) and hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        return LinearKernel(model, scaler)
+    raise ValueError(f"❌ Cannot compile a {type(model).__name__}; supported: linear models, decision trees, random forests")
+
+
+def check_equivalence(kernel, model, scaler, features, rtol=1e-9, atol=1e-12):
+    """
+    Compare the kernel with scaler.transform + model.predict on features
+    Returns the largest absolute difference; raises ValueError outside the tolerance
+    """
+    features = np.asarray(features, dtype=np.float64)
+    expected = score_features(features, model, scaler)
+    actual = kernel(features)
+    if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+        worst = int(np.argmax(np.abs(actual - expected)))
+        raise ValueError(f"❌ Kernel disagrees with the model on row {worst}: {actual[worst]!r} != {expected[worst]!r}")
+    return float(np.max(np.abs(actual - expected))) if len(features) else 0.0
+
+
+# Compiled kernels per (model, scaler) name pair, with the artifact versions they were built from
+_kernels = {}
+_kernels_lock = threading.Lock()
+
+
+def load_kernel(model_name='model.pkl', scaler_name='scaler.pkl'):
+    """Return the compiled kernel for the current model/scaler artifacts, recompiling when either changes"""
+    registry = get_registry()
+    version = (registry.version(model_name), registry.version(scaler_name))
+    with _kernels_lock:
+        cached = _kernels.get((model_name, scaler_name))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        model, scaler = load_model_and_scaler(model_name, scaler_name)
+        kernel = compile_model(model, scaler)
+        _kernels[(model_name, scaler_name)] = (version, kernel)
+        return kernel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the model into a NumPy kernel and check it against sklearn")
+    parser.add_argument('--model', default='model.pkl')
+    parser.add_argument('--scaler', default='scaler.pkl')
+    parser.add_argument('--data', default='output.csv', help="feature table to check on")
+    parser.add_argument('--samples', type=int, default=100000, help="extra random rows to check")
+    args = parser.parse_args()
+
+    model, scaler = load_model_and_scaler(args.model, args.scaler)
+    kernel = load_kernel(args.model, args.scaler)
+    features = pd.read_csv(args.data)[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    # Random rows spanning the observed range of each feature
+    rng = np.random.default_rng(0)
+    low, high = features.min(axis=0), features.max(axis=0)
+    random_rows = rng.uniform(low, high, size=(args.samples, len(FEATURE_COLUMNS)))
+    diff = max(check_equivalence(kernel, model, scaler, features),
+               check_equivalence(kernel, model, scaler, random_rows))
+    print(f"✅ {type(kernel).__name__} matches {type(model).__name__} on {len(features) + args.samples} rows "
+          f"(max difference {diff:.2e})")
+
+    row = features[0]
+    number = 2000
+    sklearn_time = timeit.timeit(lambda: score_features(row.reshape(1, -1), model, scaler), number=number) / number
+    kernel_time = timeit.timeit(lambda: kernel.predict_one(row), number=number) / number
+    print(f"   Single row: sklearn {sklearn_time * 1e6:.1f} µs, kernel {kernel_time * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
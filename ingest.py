@@ -0,0 +1,222 @@
+import argparse
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from batch_predict import score_frame
+from build_dataset import DATASET_PATH, SCHEMA, apply_schema, ensure_dataset, state_of, write_parquet
+from location_keys import canonical_location, clean_location, join_coordinates
+from model_registry import get_registry, load_model_and_scaler
+from score_index import ScoreIndex
+from spatial_index import SpatialIndex
+
+
+def delta_dir(dataset_path=DATASET_PATH):
+    """Directory holding the append-only update segments of a dataset"""
+    return f"{dataset_path}.deltas"
+
+
+def list_segments(dataset_path=DATASET_PATH):
+    """Segment files in the order they were appended"""
+    directory = delta_dir(dataset_path)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith('.parquet')]
+
+
+def segment_number(path):
+    """Sequence number of a segment file"""
+    return int(os.path.basename(path).split('.')[0])
+
+
+class LocationStore:
+    def __init__(self, base_df):
+        """
+        Shared view of the dataset: the base artifact plus applied segments
+        `df` is read-only: updates publish a new frame instead of writing to
+        the old one, so sessions may keep referencing a frame without copying.
+        Hold `lock` while reading the indexes together with `df`.
+        """
+        self.lock = threading.Lock()
+        self.df = base_df
+        self.score_index = ScoreIndex(base_df['suitability_score'].to_numpy())
+        self.spatial_index = SpatialIndex(base_df['lats'].to_numpy(), base_df['longs'].to_numpy())
+        self.segments = []
+        # Rows any segment changed or added, i.e. what compaction has to keep
+        self._touched = set()
+        # Upserts match on the canonical location, so spelling variations update the same row
+        self._rows = {location: row for row, location in enumerate(canonical_location(base_df['location']))}
+        self._next_key = int(base_df['location_key'].max()) + 1 if len(base_df) else 0
+
+    def apply(self, delta):
+        """
+        Upsert delta rows by location, publish the new frame and update both indexes in place
+        Each segment costs O(rows): the frame is copied once and both index
+        updates scan every entry; only the delta rows are sorted or re-scored
+        """
+        canonical = canonical_location(delta['location'])
+        last = ~canonical.duplicated(keep='last').to_numpy()
+        delta = delta[last].reindex(columns=self.df.columns)
+        canonical = canonical[last]
+        existing = canonical.map(self._rows)
+        is_new = existing.isna().to_numpy()
+
+        # Readers may still hold the current frame, so changes go to a copy
+        df = self.df.copy()
+        changed = delta[~is_new].copy()
+        changed_rows = existing[~is_new].to_numpy(dtype=np.intp)
+        # Existing rows keep their key and display name, and their coordinates unless new ones are given
+        for column in ['location_key', 'location', 'state']:
+            changed[column] = df[column].to_numpy()[changed_rows]
+        for column in ['lats', 'longs']:
+            changed[column] = changed[column].fillna(pd.Series(df[column].to_numpy()[changed_rows], index=changed.index))
+        for column_index, column in enumerate(df.columns):
+            values = changed[column].to_numpy()
+            # A delta may have fallen back to float where the frame still holds integers
+            if len(changed) and df[column].dtype.kind in 'iu' and not np.can_cast(values.dtype, df[column].dtype):
+                df[column] = df[column].astype(np.result_type(df[column].dtype, values.dtype))
+            df.iloc[changed_rows, column_index] = values
+
+        added = delta[is_new].copy()
+        added_rows = np.arange(len(df), len(df) + len(added), dtype=np.intp)
+        if len(added):
+            added['location_key'] = np.arange(self._next_key, self._next_key + len(added), dtype=np.int32)
+            self._next_key += len(added)
+            df = pd.concat([df, added], ignore_index=True)
+            # New names make concat fall back to object; re-encode the dictionary columns
+            for column in df.columns:
+                if SCHEMA.get(column) == 'category' and df[column].dtype != 'category':
+                    df[column] = df[column].astype('category')
+            self._rows.update(zip(canonical[is_new], added_rows))
+        self.df = df
+
+        rows = np.concatenate([changed_rows, added_rows])
+        updated = pd.concat([changed, added])
+        self._touched.update(rows.tolist())
+        self.score_index.update(rows, updated['suitability_score'].to_numpy(dtype=float))
+        self.spatial_index.update(rows, updated['lats'].to_numpy(dtype=float), updated['longs'].to_numpy(dtype=float))
+        return len(changed), len(added)
+
+    def refresh(self, dataset_path=DATASET_PATH):
+        """Apply any segments written since the last refresh"""
+        with self.lock:
+            for path in list_segments(dataset_path):
+                if self.segments and segment_number(path) <= segment_number(self.segments[-1]):
+                    continue
+                try:
+                    delta = pd.read_parquet(path)
+                except FileNotFoundError:
+                    # Folded into a later segment by a concurrent compaction
+                    continue
+                self.apply(delta)
+                self.segments.append(path)
+
+    @property
+    def version(self):
+        """Number of the last segment applied on top of the base artifact (0 = none)"""
+        return segment_number(self.segments[-1]) if self.segments else 0
+
+
+def _read_store(f):
+    return LocationStore(pd.read_parquet(f))
+
+
+def load_store(dataset_path=DATASET_PATH):
+    """
+    Return the shared store for the dataset, with all segments applied
+    A rebuilt base artifact yields a fresh store; new segments are applied in place
+    """
+    store = get_registry().get(ensure_dataset(dataset_path), loader=_read_store)
+    store.refresh(dataset_path)
+    return store
+
+
+def store_version(dataset_path=DATASET_PATH):
+    """(base artifact hash, applied segment count) of the current store"""
+    store = load_store(dataset_path)
+    return get_registry().version(ensure_dataset(dataset_path), loader=_read_store), store.version
+
+
+def prepare_records(records, coords=None):
+    """
+    Normalize new/changed location records into dataset rows
+    records: output.csv-style rows; rows without suitability_score are scored by the model
+    coords: optional combined_data.csv-style table supplying lats/longs
+    """
+    if coords is not None:
+        records, _ = join_coordinates(records.drop(columns=['lats', 'longs'], errors='ignore'), coords)
+    # Keys are assigned by the store when the segment is applied
+    records = records.drop(columns=['location_key'], errors='ignore')
+    records['location'] = clean_location(records['location'])
+    for column in ['lats', 'longs']:
+        if column not in records.columns:
+            records[column] = np.nan
+
+    if 'suitability_score' not in records.columns:
+        records['suitability_score'] = np.nan
+    unscored = records['suitability_score'].isna().to_numpy()
+    if unscored.any():
+        model, scaler = load_model_and_scaler()
+        records.loc[unscored, 'suitability_score'] = score_frame(records[unscored], model, scaler)
+    records['state'] = state_of(records['location'])
+    return apply_schema(records)
+
+
+def ingest(records, dataset_path=DATASET_PATH, coords=None):
+    """Append records as the next segment of the dataset; return the segment path"""
+    segment = prepare_records(records, coords)
+    directory = delta_dir(dataset_path)
+    os.makedirs(directory, exist_ok=True)
+
+    existing = list_segments(dataset_path)
+    number = segment_number(existing[-1]) + 1 if existing else 1
+    path = os.path.join(directory, f"{number:06d}.parquet")
+    write_parquet(segment, path)
+    return path
+
+
+def compact(dataset_path=DATASET_PATH):
+    """
+    Fold every applied segment into one segment holding the final state of the rows they touched
+    The base artifact is left alone: it is a cache rebuilt from the CSVs, so the
+    segments stay the only durable copy of ingested records. The folded segment
+    takes the last segment's number, so stores that already applied it skip it.
+    Returns the number of segment files folded
+    """
+    store = load_store(dataset_path)
+    with store.lock:
+        if not store.segments:
+            return 0
+        folded = store.df.iloc[sorted(store._touched)]
+        last = store.segments[-1]
+    segments = [path for path in list_segments(dataset_path) if segment_number(path) <= segment_number(last)]
+    write_parquet(folded, last)
+    for path in segments:
+        if path != last:
+            os.remove(path)
+    return len(segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new or changed location records to the dataset")
+    parser.add_argument('records', nargs='?', help="CSV in output.csv format (lats/longs and suitability_score optional)")
+    parser.add_argument('--coords', default=None, help="CSV in combined_data.csv format to take lats/longs from")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="dataset artifact the segment belongs to")
+    parser.add_argument('--compact', action='store_true', help="fold all segments into one")
+    args = parser.parse_args()
+
+    if args.compact:
+        print(f"✅ Folded {compact(args.dataset)} segments into one in '{delta_dir(args.dataset)}'")
+        return
+    if args.records is None:
+        parser.error("records is required unless --compact is given")
+    records = pd.read_csv(args.records)
+    coords = pd.read_csv(args.coords) if args.coords else None
+    path = ingest(records, args.dataset, coords)
+    print(f"✅ Appended {len(records)} records as '{path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+
+def clean_location(locations):
+    """Normalize the padded 'City    ,State(*)   ' strings to 'City, State'"""
+    locations = locations.str.lstrip(',').str.strip()  # Remove leading commas
+    locations = locations.str.replace(r'\(.*\)', '', regex=True).str.strip()  # Remove trailing characters
+    # Strip every comma-separated part and re-join with ', '
+    return locations.str.replace(r'\s*,\s*', ', ', regex=True)
+
+
+def canonical_location(locations):
+    """
+    Canonical 'city,state' string used as the join key
+    Case, whitespace, punctuation and '(...)' suffixes are ignored, so
+    'Vizianagaram ,Andhra Pradesh(*)' and 'vizianagaram, AndhraPradesh' agree.
+    """
+    locations = clean_location(locations.astype('string')).str.casefold()
+    parts = locations.str.split(',', n=1, expand=True).reindex(columns=[0, 1])
+    city = parts[0].str.replace(r'[^0-9a-z]', '', regex=True)
+    state = parts[1].fillna('').str.replace(r'[^0-9a-z]', '', regex=True)
+    return (city + ',' + state).astype(object)
+
+
+def _city(canonical):
+    """City part of canonical keys"""
+    return canonical.str.split(',', n=1).str[0]
+
+
+class LocationKeys:
+    def __init__(self, *location_columns):
+        """
+        Dictionary of canonical locations, built once from every given column
+        Each distinct location gets a small integer key (its dictionary index)
+        """
+        canonical = pd.concat([canonical_location(column) for column in location_columns], ignore_index=True)
+        self.index = pd.Index(canonical.dropna().unique())
+
+    def __len__(self):
+        return len(self.index)
+
+    def encode(self, locations):
+        """Integer keys for a column of raw location strings (-1 if not in the dictionary)"""
+        return self.index.get_indexer(canonical_location(locations)).astype(np.int32)
+
+
+def join_coordinates(features, coords, keys=None):
+    """
+    Attach lats/longs to the feature table via integer location keys
+    features: output.csv-style table; coords: combined_data.csv-style table
+    Rows whose 'city,state' key has no coordinates fall back to the city
+    alone when that city name is unique among the coordinates.
+    Returns (joined table with a 'location_key' column, unmatched rows)
+    """
+    if keys is None:
+        keys = LocationKeys(features['location'], coords['location'])
+    feature_keys = keys.encode(features['location'])
+    coord_keys = keys.encode(coords['location'])
+
+    # Dense key -> coordinate arrays turn the join into one gather; first occurrence wins
+    lats = np.full(len(keys) + 1, np.nan)
+    longs = np.full(len(keys) + 1, np.nan)
+    first = pd.Series(coord_keys).drop_duplicates(keep='first')
+    first = first[first.to_numpy() >= 0]
+    lats[first.to_numpy()] = coords['lats'].to_numpy(dtype=float)[first.index]
+    longs[first.to_numpy()] = coords['longs'].to_numpy(dtype=float)[first.index]
+
+    # Key -1 (not in the dictionary) reads the trailing NaN slot
+    joined_lats = lats[feature_keys]
+    joined_longs = longs[feature_keys]
+
+    # State suffix missing or different: retry on the city name if it is unambiguous
+    missing = np.flatnonzero(np.isnan(joined_lats) & (feature_keys >= 0))
+    if len(missing):
+        cities = _city(pd.Series(keys.index, dtype=object)).to_numpy(dtype=object)
+        located = np.flatnonzero(~np.isnan(lats[:-1]))
+        city_keys = pd.Series(located, index=cities[located])
+        city_keys = city_keys[~city_keys.index.duplicated(keep=False)]
+        fallback = pd.Series(cities[feature_keys[missing]]).map(city_keys)
+        found = fallback.notna().to_numpy()
+        fallback_keys = fallback[found].to_numpy(dtype=np.intp)
+        joined_lats[missing[found]] = lats[fallback_keys]
+        joined_longs[missing[found]] = longs[fallback_keys]
+
+    joined = features.copy()
+    joined['location_key'] = feature_keys
+    joined['lats'] = joined_lats
+    joined['longs'] = joined_longs
+    unmatched = joined[np.isnan(joined_lats)]
+    return joined, unmatched
@@ -0,0 +1,57 @@
+import folium
+from folium.plugins import FastMarkerCluster
+
+# Below this many sites every marker is shown individually, as before
+CLUSTER_THRESHOLD = 50
+
+# Builds one marker per data row in the browser; the popup HTML is filled from
+# the row instead of being shipped pre-rendered for every site
+_MARKER_CALLBACK = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: row[2], iconColor: 'white', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    var popup = '<div style="width: 300px; font-family: Arial; font-size: 12px;">'
+        + '<h4 style="color: #2A9D8F;">' + row[3] + '</h4>'
+        + '<p><strong>Classification:</strong> ' + row[4] + '</p>'
+        + '<p><strong>Population:</strong> ' + row[5] + '</p>'
+        + '<p><strong>Road Quality:</strong> ' + row[6] + '</p>'
+        + '<p><strong>Tier Value:</strong> ' + row[7] + '</p>'
+        + '<p><strong>Literacy Rate:</strong> ' + row[8] + '</p>'
+        + '<p><strong>Railways Count:</strong> ' + row[9] + '</p>'
+        + '<p><strong>Average Land Price (per sqft) :</strong> ' + row[10] + ' Rs</p>'
+        + '<p><strong>Airport Proximity:</strong> ' + row[11] + ' Km</p>'
+        + '</div>';
+    marker.bindPopup(popup, {maxWidth: 300});
+    return marker;
+};
+"""
+
+
+def marker_rows(valid_cities, color_scheme):
+    """Column-wise build of the [lat, lon, color, popup fields...] rows sent to the browser"""
+    columns = [
+        valid_cities['lats'],
+        valid_cities['longs'],
+        valid_cities['classification'].map(color_scheme).fillna('gray'),
+        valid_cities['location'],
+        valid_cities['classification'],
+        valid_cities['population'].map('{:,}'.format),
+        valid_cities['dist_road_qual'].astype(str),
+        valid_cities['tier_value'].astype(str),
+        valid_cities['literacy_rate'].astype(str),
+        valid_cities['railways_count'].astype(str),
+        valid_cities['average_land_price'].map('{:.2f}'.format),
+        valid_cities['airport_proximity'].astype(str),
+    ]
+    return [list(row) for row in zip(*(column.tolist() for column in columns))]
+
+
+def sites_map(valid_cities, color_scheme):
+    """
+    Folium map of the given sites as one FastMarkerCluster layer
+    valid_cities: rows with lats/longs, classification and the feature columns
+    """
+    m = folium.Map(location=[valid_cities['lats'].mean(), valid_cities['longs'].mean()], zoom_start=5, tiles='CartoDB positron')
+    options = {'disableClusteringAtZoom': 1} if len(valid_cities) < CLUSTER_THRESHOLD else {}
+    FastMarkerCluster(marker_rows(valid_cities, color_scheme), callback=_MARKER_CALLBACK, options=options).add_to(m)
+    return m
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import pickle
+import threading
+
+from profiling import span
+
+# Column order the scaler and model were fitted with
+FEATURE_COLUMNS = [
+    'population', 'dist_road_qual', 'tier_value', 'edi',
+    'literacy_rate', 'railways_count', 'average_land_price', 'airport_proximity',
+]
+
+
+class ModelRegistry:
+    def __init__(self, base_dir=None):
+        """
+        Process-wide cache of the pickled artifacts (model.pkl, scaler.pkl, ...)
+        base_dir: directory the artifact names are resolved against (defaults to cwd)
+        """
+        self.base_dir = base_dir or os.getcwd()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        """Resolve an artifact name to an absolute path"""
+        return name if os.path.isabs(name) else os.path.join(self.base_dir, name)
+
+    @staticmethod
+    def _file_hash(path):
+        """SHA-256 of the file contents, used as the artifact version"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _refresh(self, name, loader):
+        """Load the artifact if it is new or its file changed on disk"""
+        path = self._path(name)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        # The same file can back several artifacts (e.g. a table and an index built from it)
+        key = (path, loader)
+        entry = self._entries.get(key)
+
+        # Fast path: file untouched since the last load
+        if entry is not None and entry['signature'] == signature:
+            return entry
+
+        # mtime changed - only reload when the contents actually differ
+        file_hash = self._file_hash(path)
+        if entry is not None and entry['hash'] == file_hash:
+            entry['signature'] = signature
+            return entry
+
+        with open(path, 'rb') as f, span(f"load {os.path.basename(path)}"):
+            obj = loader(f)
+        entry = {'obj': obj, 'hash': file_hash, 'signature': signature}
+        self._entries[key] = entry
+        return entry
+
+    def get(self, name, loader=pickle.load):
+        """
+        Return the shared, read-only instance of an artifact
+        loader: function(file) -> object; cached per (file, loader), so pass a
+                module-level function rather than a fresh lambda
+        """
+        with self._lock:
+            return self._refresh(name, loader)['obj']
+
+    def version(self, name, loader=pickle.load):
+        """Return the content hash of the currently loaded artifact"""
+        with self._lock:
+            return self._refresh(name, loader)['hash']
+
+    def clear(self):
+        """Drop every cached artifact"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Module-level registry: Streamlit re-executes the app script on every rerun,
+# but imported modules stay in sys.modules, so this is shared by all sessions
+_default_registry = ModelRegistry()
+
+
+def get_registry():
+    """Return the process-wide registry"""
+    return _default_registry
+
+
+def load_model_and_scaler(model_name='model.pkl', scaler_name='scaler.pkl'):
+    """Return the (model, scaler) pair from the process-wide registry"""
+    return _default_registry.get(model_name), _default_registry.get(scaler_name)
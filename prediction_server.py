@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import json
+
+import numpy as np
+import tornado.ioloop
+import tornado.web
+
+from model_registry import FEATURE_COLUMNS
+from profiling import get_profiler, span
+from suitability import nearest_cities_batch, predict_scores
+
+
+class MicroBatcher:
+    def __init__(self, handle, max_batch_size=256, max_delay=0.002):
+        """
+        Coalesce concurrent requests into one call
+        handle: function(list of requests) -> list of results, run off the event loop
+        max_batch_size: most requests handled per call
+        max_delay: seconds to wait for more requests after the first one arrives
+        """
+        self.handle = handle
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = asyncio.Queue()
+
+    async def submit(self, request):
+        """Queue one request and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _next_batch(self):
+        """Wait for one request, then collect more until the batch is full or the delay passes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        """Serve batches forever"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            try:
+                # Keep the event loop free while the batch is handled
+                results = await loop.run_in_executor(None, self.handle, [request for request, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def answer_batch(requests):
+    """
+    JSON response bodies for a batch of (features, k) requests
+    Scoring, the top-k lookups, classification and serialization each run once for the whole batch
+    """
+    features = np.array([features for features, _ in requests], dtype=np.float64)
+    scores = predict_scores(features)
+    cities, bounds = nearest_cities_batch(scores, [k for _, k in requests])
+    with span('serialize'):
+        # to_json turns NaN coordinates into null and numpy scalars into plain numbers
+        records = json.loads(cities.to_json(orient='records'))
+        return [f'{{"predicted_score": {json.dumps(float(score))}, '
+                f'"cities": {json.dumps(records[start:stop], separators=(",", ":"))}}}'
+                for score, (start, stop) in zip(scores, bounds)]
+
+
+def parse_features(payload):
+    """Accept the 8 features as a list in FEATURE_COLUMNS order or as a dict"""
+    features = payload.get('features')
+    if isinstance(features, dict):
+        missing = [column for column in FEATURE_COLUMNS if column not in features]
+        if missing:
+            raise ValueError(f"missing features: {missing}")
+        features = [features[column] for column in FEATURE_COLUMNS]
+    if not isinstance(features, list) or len(features) != len(FEATURE_COLUMNS):
+        raise ValueError(f"'features' must be a list of {len(FEATURE_COLUMNS)} numbers or a dict of {FEATURE_COLUMNS}")
+    features = [float(value) for value in features]
+    # float() accepts 'nan'/'inf', which would score as NaN and match arbitrary cities
+    if not np.isfinite(features).all():
+        raise ValueError("features must be finite numbers")
+    return features
+
+
+class PredictHandler(tornado.web.RequestHandler):
+    def initialize(self, batcher, max_k):
+        self.batcher = batcher
+        self.max_k = max_k
+
+    async def post(self):
+        """{"features": [...], "k": 10} -> predicted score and the k nearest cities"""
+        try:
+            payload = json.loads(self.request.body)
+            features = parse_features(payload)
+            k = int(payload.get('k', 10))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise tornado.web.HTTPError(400, reason=str(e))
+        if not 1 <= k <= self.max_k:
+            raise tornado.web.HTTPError(400, reason=f"k must be between 1 and {self.max_k}")
+
+        with span('request'):
+            body = await self.batcher.submit((features, k))
+        self.set_header('Content-Type', 'application/json')
+        self.finish(body)
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.finish({'status': 'ok'})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        """Per-stage timings in the Prometheus text format"""
+        self.set_header('Content-Type', 'text/plain; version=0.0.4')
+        self.finish(get_profiler().prometheus_text())
+
+
+def make_app(batcher, max_k=100):
+    return tornado.web.Application([
+        (r'/predict', PredictHandler, {'batcher': batcher, 'max_k': max_k}),
+        (r'/health', HealthHandler),
+        (r'/metrics', MetricsHandler),
+    ])
+
+
+async def serve(port=8600, max_batch_size=256, max_delay=0.002):
+    """Start the HTTP service and its batching loop"""
+    # Load the model, dataset and indexes before accepting traffic
+    answer_batch([(np.zeros(len(FEATURE_COLUMNS)), 1)])
+
+    batcher = MicroBatcher(answer_batch, max_batch_size, max_delay)
+    make_app(batcher).listen(port)
+    print(f"🚀 SpotPerfect prediction service listening on :{port}")
+    await batcher.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP suitability prediction service")
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--max-batch-size', type=int, default=256, help="most requests scored per model call")
+    parser.add_argument('--max-delay-ms', type=float, default=2.0, help="how long to wait to fill a batch")
+    args = parser.parse_args()
+    asyncio.run(serve(args.port, args.max_batch_size, args.max_delay_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
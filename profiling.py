@@ -0,0 +1,105 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('spotperfect.profiling')
+
+QUANTILES = [0.5, 0.99]
+
+
+class Profiler:
+    def __init__(self, window=1024):
+        """
+        Process-wide timings of named pipeline stages
+        window: most recent durations kept per stage for the p50/p99 estimates
+        """
+        self.window = window
+        self._durations = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        # Spans of the trace running on each thread (e.g. one Streamlit rerun)
+        self._local = threading.local()
+
+    def record(self, stage, seconds):
+        """Add one duration to a stage"""
+        with self._lock:
+            if stage not in self._durations:
+                self._durations[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+                self._totals[stage] = 0.0
+            self._durations[stage].append(seconds)
+            self._counts[stage] += 1
+            self._totals[stage] += seconds
+        spans = getattr(self._local, 'spans', None)
+        if spans is not None:
+            spans.append((stage, seconds))
+        logger.debug(json.dumps({'stage': stage, 'ms': round(seconds * 1000, 3)}))
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one run of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def start_trace(self):
+        """Start collecting the spans recorded on this thread (e.g. during one Streamlit rerun)"""
+        self._local.spans = []
+
+    def stop_trace(self):
+        """Stop collecting and return this thread's spans as (stage, seconds) pairs"""
+        spans = getattr(self._local, 'spans', None) or []
+        self._local.spans = None
+        return spans
+
+    def summary(self):
+        """One row per stage: count, total seconds and p50/p99 in ms over the recent window"""
+        with self._lock:
+            stages = {stage: np.array(durations) for stage, durations in self._durations.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+        rows = []
+        for stage, durations in stages.items():
+            p50, p99 = np.quantile(durations, QUANTILES) * 1000
+            rows.append({'stage': stage, 'count': counts[stage], 'total_s': totals[stage],
+                         'p50_ms': p50, 'p99_ms': p99})
+        return pd.DataFrame(rows, columns=['stage', 'count', 'total_s', 'p50_ms', 'p99_ms'])
+
+    def prometheus_text(self, name='spotperfect_stage_seconds'):
+        """Every stage as a Prometheus summary in the text exposition format"""
+        lines = [f"# HELP {name} Duration of SpotPerfect pipeline stages", f"# TYPE {name} summary"]
+        for row in self.summary().itertuples(index=False):
+            for quantile, value in zip(QUANTILES, [row.p50_ms, row.p99_ms]):
+                lines.append(f'{name}{{stage="{row.stage}",quantile="{quantile}"}} {value / 1000:.9f}')
+            lines.append(f'{name}_sum{{stage="{row.stage}"}} {row.total_s:.9f}')
+            lines.append(f'{name}_count{{stage="{row.stage}"}} {row.count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+
+# Module-level profiler shared by every session, like the model registry
+_default_profiler = Profiler()
+
+
+def get_profiler():
+    """Return the process-wide profiler"""
+    return _default_profiler
+
+
+def span(stage):
+    """Time a block with the process-wide profiler"""
+    return _default_profiler.span(stage)
@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+
+from ingest import store_version
+from model_registry import get_registry
+from rule_engine import rule_set_version
+from suitability import nearest_cities, predict_score
+
+
+def artifact_version():
+    """Content hashes of everything a cached result depends on"""
+    registry = get_registry()
+    return (
+        registry.version('model.pkl'),
+        registry.version('scaler.pkl'),
+        store_version(),
+        rule_set_version(),
+    )
+
+
+class ResultCache:
+    def __init__(self, maxsize=512, ttl=3600, quantum=1.0):
+        """
+        LRU + TTL cache of full prediction results, shared by every session
+        maxsize: most distinct inputs kept
+        ttl: seconds an entry lives
+        quantum: inputs are rounded to multiples of this before keying
+        """
+        self.quantum = quantum
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version = None
+
+    def key(self, features, k):
+        """Quantized feature vector plus k"""
+        steps = np.round(np.asarray(features, dtype=np.float64) / self.quantum).astype(np.int64)
+        return tuple(steps.tolist()), int(k)
+
+    def get(self, features, k):
+        """
+        Return the result for this input, computing it on a miss
+        The result is a dict with 'predicted_score', 'cities' and a 'payloads'
+        dict where renderers store their map/chart output for reuse.
+        Treat it as read-only apart from filling in payloads.
+        """
+        version = artifact_version()
+        key = self.key(features, k)
+        with self._lock:
+            # A new model, dataset or rule file makes every cached result stale
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        score = predict_score(features)
+        result = {'predicted_score': score, 'cities': nearest_cities(score, k), 'payloads': {}}
+        with self._lock:
+            if self._version == version:
+                # Keep the first result if another session computed it concurrently
+                result = self._cache.setdefault(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Shared by every Streamlit session in the process
+_default_cache = ResultCache()
+
+
+def get_result_cache():
+    """Return the process-wide result cache"""
+    return _default_cache
@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_registry import get_registry
+
+DEFAULT_RULES_PATH = os.path.join('rules', 'default.json')
+
+# Leaf comparison operators; 'between' is exclusive on both ends like `low < x < high`
+_OPERATORS = {
+    '>': lambda values, value: values > value,
+    '>=': lambda values, value: values >= value,
+    '<': lambda values, value: values < value,
+    '<=': lambda values, value: values <= value,
+    '==': lambda values, value: values == value,
+    '!=': lambda values, value: values != value,
+    'in': lambda values, value: np.isin(values, value),
+    'between': lambda values, value: (values > value[0]) & (values < value[1]),
+}
+
+
+def _freeze(value):
+    """Hashable form of a leaf value, used as the shared-mask cache key"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _compile_condition(node, columns):
+    """
+    Compile a condition node into a function(context) -> boolean mask
+    node: {"all": [...]}, {"any": [...]} or a leaf {"column", "op", "value"}
+    columns: set collecting every column the rule set reads
+    """
+    if 'all' in node or 'any' in node:
+        combine = np.logical_and if 'all' in node else np.logical_or
+        children = [_compile_condition(child, columns) for child in node.get('all', node.get('any'))]
+        if not children:
+            raise ValueError(f"❌ Empty condition group: {node}")
+
+        def evaluate_group(context):
+            mask = children[0](context)
+            for child in children[1:]:
+                mask = combine(mask, child(context))
+            return mask
+        return evaluate_group
+
+    try:
+        column, op, value = node['column'], node['op'], node['value']
+    except KeyError as e:
+        raise ValueError(f"❌ Rule condition is missing {e}: {node}") from None
+    if op not in _OPERATORS:
+        raise ValueError(f"❌ Unknown operator '{op}' (expected one of {sorted(_OPERATORS)})")
+    if op == 'between' and len(value) != 2:
+        raise ValueError(f"❌ 'between' needs [low, high], got {value}")
+
+    columns.add(column)
+    compare = _OPERATORS[op]
+    key = (column, op, _freeze(value))
+
+    def evaluate_leaf(context):
+        # Identical predicates are computed once per pass, even across rule sets
+        masks = context['masks']
+        if key not in masks:
+            masks[key] = compare(context['columns'][column], value)
+        return masks[key]
+    return evaluate_leaf
+
+
+class RuleSet:
+    def __init__(self, spec):
+        """
+        Compile a declarative rule set
+        spec: dict with "name", "default" label and an ordered list of
+              {"label", "when"} rules; the first matching rule wins
+        """
+        self.name = spec.get('name', 'rules')
+        self.default = spec['default']
+        self.columns = set()
+        self.labels = [rule['label'] for rule in spec['rules']]
+        self._conditions = [_compile_condition(rule['when'], self.columns) for rule in spec['rules']]
+
+    def _select(self, context):
+        """Label every row from an evaluation context"""
+        conditions = [condition(context) for condition in self._conditions]
+        return np.select(conditions, self.labels, default=self.default)
+
+    def evaluate(self, df):
+        """Return a numpy array with one label per row of df"""
+        return evaluate_rule_sets(df, [self])[self.name].to_numpy()
+
+
+def _make_context(df, columns):
+    """Pull every referenced column out of df once as a numpy array"""
+    missing = columns.difference(df.columns)
+    if missing:
+        raise ValueError(f"❌ Rule columns not found in data: {sorted(missing)}")
+    return {'columns': {column: df[column].to_numpy() for column in columns}, 'masks': {}}
+
+
+def evaluate_rule_sets(df, rule_sets):
+    """Evaluate several rule sets in one columnar pass; one output column per rule set"""
+    columns = set().union(*(rule_set.columns for rule_set in rule_sets))
+    context = _make_context(df, columns)
+    return pd.DataFrame({rule_set.name: rule_set._select(context) for rule_set in rule_sets}, index=df.index)
+
+
+def _read_rule_file(f):
+    """Parse a JSON (or YAML, when PyYAML is installed) rule file and compile it"""
+    name = getattr(f, 'name', '')
+    if name.endswith(('.yaml', '.yml')):
+        import yaml
+        spec = yaml.safe_load(f)
+    else:
+        spec = json.load(f)
+    return RuleSet(spec)
+
+
+def load_rule_set(path=DEFAULT_RULES_PATH):
+    """
+    Return the compiled rule set for a file
+    Compiled once and shared; edits to the file are picked up on the next call
+    """
+    return get_registry().get(os.path.abspath(path), loader=_read_rule_file)
+
+
+def rule_set_version(path=DEFAULT_RULES_PATH):
+    """Content hash of the rule file currently in use"""
+    return get_registry().version(os.path.abspath(path), loader=_read_rule_file)
+
+
+def main():
+    """Check the default rule file against the built-in classifier"""
+    from build_dataset import load_dataset
+    from classification import classify_locations
+
+    df = load_dataset()
+    rule_set = load_rule_set()
+    mismatches = int((rule_set.evaluate(df) != classify_locations(df)).sum())
+    if mismatches:
+        print(f"❌ '{rule_set.name}' rules disagree with classify_locations on {mismatches} rows")
+        raise SystemExit(1)
+    print(f"✅ '{rule_set.name}' rules match classify_locations on {len(df)} rows")
+
+
+if __name__ == "__main__":
+    main()
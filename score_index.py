@@ -0,0 +1,83 @@
+import bisect
+
+import numpy as np
+
+
+class ScoreIndex:
+    def __init__(self, scores):
+        """
+        Sorted index over a static suitability score column
+        scores: 1-D array aligned with the rows of the location table (NaNs are skipped)
+        """
+        scores = np.asarray(scores, dtype=float)
+        positions = np.flatnonzero(~np.isnan(scores))
+        # Stable sort keeps equal scores in row order, matching DataFrame.nsmallest
+        order = np.argsort(scores[positions], kind='stable')
+        self.positions = positions[order]
+        self.sorted_scores = scores[self.positions]
+
+    def __len__(self):
+        return len(self.sorted_scores)
+
+    def update(self, positions, scores):
+        """
+        Set the scores of the given rows (new or existing) without re-sorting
+        Existing entries are dropped and the new ones merged in with one
+        np.insert, keeping (score, row) order; a NaN score removes the row.
+        Still O(n) per call: np.isin and np.insert each pass over the whole index.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        scores = np.asarray(scores, dtype=float)
+
+        keep = ~np.isin(self.positions, positions)
+        self.positions = self.positions[keep]
+        self.sorted_scores = self.sorted_scores[keep]
+
+        valid = ~np.isnan(scores)
+        positions, scores = positions[valid], scores[valid]
+        order = np.lexsort((positions, scores))
+        positions, scores = positions[order], scores[order]
+
+        # Insertion points: after lower scores, and by row order among equal scores
+        left = np.searchsorted(self.sorted_scores, scores, side='left')
+        right = np.searchsorted(self.sorted_scores, scores, side='right')
+        slots = left.copy()
+        for i in np.flatnonzero(right > left):
+            slots[i] += np.searchsorted(self.positions[left[i]:right[i]], positions[i])
+
+        self.positions = np.insert(self.positions, slots, positions)
+        self.sorted_scores = np.insert(self.sorted_scores, slots, scores)
+
+    def nearest(self, target, k=10):
+        """
+        Row positions of the k scores closest to target, nearest first
+        Equivalent to nsmallest(k) on abs(score - target) (ties by row order), in O(log n + k)
+        """
+        n = len(self.sorted_scores)
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        # The k nearest scores are contiguous in sorted order around the insertion point
+        pos = np.searchsorted(self.sorted_scores, target)
+        lo, hi = pos, pos
+        while hi - lo < k:
+            if lo == 0:
+                hi = lo + k
+            elif hi == n:
+                lo = hi - k
+            elif target - self.sorted_scores[lo - 1] <= self.sorted_scores[hi] - target:
+                lo -= 1
+            else:
+                hi += 1
+
+        # Widen both sides to every score at the k-th distance, so ties across
+        # the target (and runs of equal scores) resolve by row order
+        radius = max(target - self.sorted_scores[lo], self.sorted_scores[hi - 1] - target)
+        offset = lambda score: score - target
+        lo = bisect.bisect_left(self.sorted_scores, -radius, 0, pos, key=offset)
+        hi = bisect.bisect_right(self.sorted_scores, radius, pos, n, key=offset)
+
+        candidates = self.positions[lo:hi]
+        diffs = np.abs(self.sorted_scores[lo:hi] - target)
+        return candidates[np.lexsort((candidates, diffs))[:k]]
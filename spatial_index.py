@@ -0,0 +1,153 @@
+import argparse
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from rule_engine import load_rule_set
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class SpatialIndex:
+    def __init__(self, lats, longs):
+        """
+        Haversine BallTree over the location coordinates
+        lats, longs: arrays aligned with the rows of the location table (NaNs are skipped)
+        """
+        lats = np.asarray(lats, dtype=float)
+        longs = np.asarray(longs, dtype=float)
+        positions = np.flatnonzero(~(np.isnan(lats) | np.isnan(longs)))
+        self._build(positions, np.radians(np.column_stack([lats[positions], longs[positions]])))
+
+    def _build(self, positions, points):
+        """(Re)build the tree; later updates go to a small brute-force side buffer"""
+        self.positions = positions
+        self._points = points
+        self._tree = BallTree(points, metric='haversine')
+        self._live = np.ones(len(positions), dtype=bool)
+        self._extra_positions = np.empty(0, dtype=np.intp)
+        self._extra_points = np.empty((0, 2))
+
+    def __len__(self):
+        return int(self._live.sum()) + len(self._extra_positions)
+
+    @staticmethod
+    def _point(lat, lon):
+        return np.radians([[lat, lon]])
+
+    def update(self, positions, lats, longs):
+        """
+        Set the coordinates of the given rows (new or existing)
+        The tree is not rebuilt: superseded tree entries are masked out and the
+        new points are kept in a side buffer that is scanned directly, until the
+        buffer outgrows max(1000, 10%) of the tree. Masking is still an O(n)
+        np.isin pass over every tree entry.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        points = np.radians(np.column_stack([np.asarray(lats, dtype=float), np.asarray(longs, dtype=float)]))
+
+        self._live &= ~np.isin(self.positions, positions)
+        keep = ~np.isin(self._extra_positions, positions)
+        valid = ~np.isnan(points).any(axis=1)
+        self._extra_positions = np.concatenate([self._extra_positions[keep], positions[valid]])
+        self._extra_points = np.concatenate([self._extra_points[keep], points[valid]])
+
+        if len(self._extra_positions) > max(1000, len(self.positions) // 10):
+            self._build(np.concatenate([self.positions[self._live], self._extra_positions]),
+                        np.concatenate([self._points[self._live], self._extra_points]))
+
+    def _extra_distances(self, lat, lon):
+        """Haversine distances (radians) from a point to every buffered site"""
+        lat, lon = self._point(lat, lon)[0]
+        lats, longs = self._extra_points[:, 0], self._extra_points[:, 1]
+        h = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((longs - lon) / 2) ** 2
+        return 2 * np.arcsin(np.sqrt(h))
+
+    @staticmethod
+    def _merge(positions, distances, order_limit=None):
+        """Sort candidates by distance and convert to km"""
+        order = np.argsort(distances, kind='stable')[:order_limit]
+        return positions[order], distances[order] * EARTH_RADIUS_KM
+
+    def within(self, lat, lon, radius_km):
+        """Row positions and distances (km) of every site within radius_km, nearest first"""
+        radius = radius_km / EARTH_RADIUS_KM
+        ind, dist = self._tree.query_radius(self._point(lat, lon), r=radius, return_distance=True)
+        ind, dist = ind[0], dist[0]
+        live = self._live[ind]
+        extra = self._extra_distances(lat, lon)
+        close = extra <= radius
+        return self._merge(np.concatenate([self.positions[ind[live]], self._extra_positions[close]]),
+                           np.concatenate([dist[live], extra[close]]))
+
+    def nearest(self, lat, lon, k=10):
+        """Row positions and distances (km) of the k closest sites, nearest first"""
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        # Ask the tree for enough extra hits to cover masked-out entries
+        tree_k = min(len(self.positions), k + int((~self._live).sum()))
+        dist, ind = self._tree.query(self._point(lat, lon), k=tree_k)
+        ind, dist = ind[0], dist[0]
+        live = self._live[ind]
+        return self._merge(np.concatenate([self.positions[ind[live]], self._extra_positions]),
+                           np.concatenate([dist[live], self._extra_distances(lat, lon)]), k)
+
+
+def sites_near(lat, lon, radius_km=None, k=10, min_score=None, order_by='distance'):
+    """
+    Candidate sites around a point (e.g. a depot)
+    radius_km: only sites within this distance (None = no limit)
+    k: most sites returned (None = all matches)
+    min_score: drop sites with a lower suitability_score
+    order_by: 'distance' (nearest first) or 'score' (most suitable first)
+    Returns the dataset rows with 'distance_km' and 'classification' added.
+    """
+    from ingest import load_store
+
+    if order_by not in ('distance', 'score'):
+        raise ValueError(f"❌ order_by must be 'distance' or 'score', got '{order_by}'")
+    store = load_store()
+    with store.lock:
+        index = store.spatial_index
+        if radius_km is not None:
+            positions, distances = index.within(lat, lon, radius_km)
+        elif min_score is None and order_by == 'distance' and k is not None:
+            positions, distances = index.nearest(lat, lon, k)
+        else:
+            positions, distances = index.nearest(lat, lon, len(index))
+        # Published frames are never modified, so the reference stays valid after the lock
+        dataset = store.df
+
+    scores = dataset['suitability_score'].to_numpy()[positions]
+    if min_score is not None:
+        keep = scores >= min_score
+        positions, distances, scores = positions[keep], distances[keep], scores[keep]
+    if order_by == 'score':
+        order = np.argsort(-scores, kind='stable')
+        positions, distances = positions[order], distances[order]
+    if k is not None:
+        positions, distances = positions[:k], distances[:k]
+
+    sites = dataset.iloc[positions].copy()
+    sites['distance_km'] = distances
+    sites['classification'] = load_rule_set().evaluate(sites)
+    return sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find candidate sites around a point")
+    parser.add_argument('lat', type=float)
+    parser.add_argument('lon', type=float)
+    parser.add_argument('--radius', type=float, default=None, help="search radius in km")
+    parser.add_argument('-k', type=int, default=10, help="most sites to list")
+    parser.add_argument('--min-score', type=float, default=None, help="minimum suitability score")
+    parser.add_argument('--order-by', choices=['distance', 'score'], default='distance')
+    args = parser.parse_args()
+
+    sites = sites_near(args.lat, args.lon, args.radius, args.k, args.min_score, args.order_by)
+    print(sites[['location', 'distance_km', 'suitability_score', 'classification']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
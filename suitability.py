@@ -0,0 +1,54 @@
+import numpy as np
+
+from inference import load_kernel
+from ingest import load_store
+from model_registry import FEATURE_COLUMNS
+from profiling import span
+from rule_engine import load_rule_set
+
+# Columns returned for each nearby city
+CITY_COLUMNS = ['location', 'suitability_score', 'classification', 'lats', 'longs'] + FEATURE_COLUMNS
+
+
+def predict_scores(features):
+    """Predict suitability for a (rows, 8) feature array in one kernel call"""
+    kernel = load_kernel()
+    with span('predict'):
+        return kernel(np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS)))
+
+
+def predict_score(features):
+    """Predict suitability for a single 8-feature input"""
+    kernel = load_kernel()
+    with span('predict'):
+        return kernel.predict_one(features)
+
+
+def nearest_cities_batch(scores, ks):
+    """
+    nearest_cities for many scores at once: one gather and one rule evaluation for the whole batch
+    Returns (cities, bounds): every result frame stacked in order, and the
+    (start, stop) rows of each score's cities in it
+    """
+    store = load_store()
+    rule_set = load_rule_set()
+    with span('top_k'):
+        with store.lock:
+            positions = [store.score_index.nearest(score, k) for score, k in zip(scores, ks)]
+            dataset = store.df
+        columns = [column for column in CITY_COLUMNS if column != 'classification']
+        cities = dataset.iloc[np.concatenate(positions), dataset.columns.get_indexer(columns)]
+    with span('classification'):
+        cities.insert(CITY_COLUMNS.index('classification'), 'classification', rule_set.evaluate(cities))
+    stops = np.cumsum([len(rows) for rows in positions]).tolist()
+    return cities, list(zip([0] + stops[:-1], stops))
+
+
+def nearest_cities(score, k=10):
+    """
+    The k cities whose suitability score is closest to score, nearest first
+    The shared frame is only referenced: the k result rows are gathered once
+    and classified into their own column
+    """
+    cities, _ = nearest_cities_batch([score], [k])
+    return cities
@@ -0,0 +1,131 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from inference import load_kernel
+from model_registry import FEATURE_COLUMNS
+
+# Input ranges of the app's sliders / number inputs, in FEATURE_COLUMNS order
+FEATURE_RANGES = {
+    'population': (100000, 5000000),
+    'dist_road_qual': (100000, 2000000),
+    'tier_value': (1, 3),
+    'edi': (10000, 100000),
+    'literacy_rate': (1, 10),
+    'railways_count': (1, 10),
+    'average_land_price': (1, 10000),
+    'airport_proximity': (1, 100),
+}
+# Features that only take whole values; swept over every value instead of a linspace
+DISCRETE_FEATURES = ['tier_value', 'literacy_rate', 'railways_count']
+
+# Default inputs of the app's form
+DEFAULT_INPUT = [2342868, 1122336, 3, 31009, 6, 3, 3293, 30]
+
+
+def grid_values(column, points=25, ranges=FEATURE_RANGES):
+    """Values a feature is swept over"""
+    low, high = ranges[column]
+    if column in DISCRETE_FEATURES:
+        return np.arange(low, high + 1, dtype=np.float64)
+    return np.linspace(low, high, points)
+
+
+def latin_hypercube(samples, ranges=FEATURE_RANGES, seed=0):
+    """
+    (samples, 8) Latin-hypercube design over the feature ranges
+    Each feature's range is cut into `samples` strata with one point in each
+    """
+    rng = np.random.default_rng(seed)
+    design = np.empty((samples, len(FEATURE_COLUMNS)))
+    for i, column in enumerate(FEATURE_COLUMNS):
+        low, high = ranges[column]
+        strata = (rng.permutation(samples) + rng.uniform(size=samples)) / samples
+        design[:, i] = low + strata * (high - low)
+        if column in DISCRETE_FEATURES:
+            design[:, i] = np.round(design[:, i])
+    return design
+
+
+def sweep(base, points=25, samples=200, ranges=FEATURE_RANGES, seed=0, predict=None):
+    """
+    What-if analysis around one input, scored in a single batched model call
+    base: the 8 feature values being explored
+    points: grid points per continuous feature
+    samples: Latin-hypercube rows averaged over for partial dependence
+    predict: function((rows, 8) array) -> scores (defaults to the compiled model kernel)
+    Returns a dict with
+      'base_score': score of base
+      'curves': one row per (feature, value) with 'score' (only that feature
+                changed from base) and 'partial_dependence' (mean score over
+                the Latin-hypercube rows with that feature set to value)
+      'sensitivity': per feature, the scores at the low/high end of its range
+                     with the rest at base, largest swing first (tornado order)
+    """
+    base = np.asarray(base, dtype=np.float64).reshape(len(FEATURE_COLUMNS))
+    predict = predict or load_kernel()
+    background = latin_hypercube(samples, ranges, seed)
+
+    # Stack every scenario into one matrix, remembering where each block starts
+    blocks, curve_rows = [base[None, :]], []
+    for i, column in enumerate(FEATURE_COLUMNS):
+        values = grid_values(column, points, ranges)
+        one_at_a_time = np.repeat(base[None, :], len(values), axis=0)
+        one_at_a_time[:, i] = values
+        averaged = np.repeat(background[None, :, :], len(values), axis=0)
+        averaged[:, :, i] = values[:, None]
+        blocks += [one_at_a_time, averaged.reshape(-1, len(FEATURE_COLUMNS))]
+        curve_rows.append((column, values))
+    extremes = np.repeat(base[None, :], 2 * len(FEATURE_COLUMNS), axis=0)
+    for i, column in enumerate(FEATURE_COLUMNS):
+        extremes[2 * i, i], extremes[2 * i + 1, i] = ranges[column]
+    blocks.append(extremes)
+
+    scores = np.asarray(predict(np.vstack(blocks)), dtype=np.float64)
+
+    curves, offset = [], 1
+    for column, values in curve_rows:
+        n = len(values)
+        one_at_a_time = scores[offset:offset + n]
+        offset += n
+        averaged = scores[offset:offset + n * samples].reshape(n, samples).mean(axis=1)
+        offset += n * samples
+        curves.append(pd.DataFrame({'feature': column, 'value': values,
+                                    'score': one_at_a_time, 'partial_dependence': averaged}))
+
+    low_high = scores[offset:].reshape(len(FEATURE_COLUMNS), 2)
+    sensitivity = pd.DataFrame({
+        'feature': FEATURE_COLUMNS,
+        'low_score': low_high[:, 0],
+        'high_score': low_high[:, 1],
+        'swing': np.abs(low_high[:, 1] - low_high[:, 0]),
+    }).sort_values('swing', ascending=False, kind='stable', ignore_index=True)
+
+    return {
+        'base_score': float(scores[0]),
+        'curves': pd.concat(curves, ignore_index=True),
+        'sensitivity': sensitivity,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the model inputs around one point")
+    parser.add_argument('--features', type=float, nargs=len(FEATURE_COLUMNS), default=DEFAULT_INPUT,
+                        metavar='X', help=f"base input in order: {', '.join(FEATURE_COLUMNS)}")
+    parser.add_argument('--points', type=int, default=25, help="grid points per continuous feature")
+    parser.add_argument('--samples', type=int, default=200, help="Latin-hypercube rows for partial dependence")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = sweep(args.features, args.points, args.samples)
+    elapsed = time.perf_counter() - start
+    rows = 1 + sum(len(grid_values(column, args.points)) for column in FEATURE_COLUMNS) * (1 + args.samples) \
+        + 2 * len(FEATURE_COLUMNS)
+    print(f"✅ Scored {rows} scenarios in one batch ({elapsed * 1000:.1f} ms); base score {result['base_score']:.6f}")
+    print(result['sensitivity'].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
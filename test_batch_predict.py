@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_predict import SCORE_COLUMN, predict_batch, predict_parallel, score_frame
+from model_registry import FEATURE_COLUMNS, load_model_and_scaler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    """Feature rows whose extra columns change inferred dtype between 5-row chunks"""
+    df = pd.read_csv(os.path.join(HERE, 'output.csv')).head(20)[['location'] + FEATURE_COLUMNS]
+    df['notes'] = [None] * 5 + ['corner lot'] * 5 + [None] * 10   # float64 in chunk 1, text in chunk 2
+    df['parcels'] = [1] * 10 + [np.nan, 3] * 5                      # int64, then float64
+    df['zone'] = [np.nan] * 15 + ['B'] * 5                          # all-null until the last chunk
+    path = tmp_path / 'sites.csv'
+    df.to_csv(path, index=False)
+    return path
+
+
+def expected_scores(path):
+    model, scaler = load_model_and_scaler(os.path.join(HERE, 'model.pkl'), os.path.join(HERE, 'scaler.pkl'))
+    return score_frame(pd.read_csv(path), model, scaler)
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'csv'])
+def test_mixed_dtype_chunks(mixed_csv, tmp_path, extension):
+    output = tmp_path / f'scored.{extension}'
+    rows = predict_batch(str(mixed_csv), str(output), chunksize=5,
+                         model_name=os.path.join(HERE, 'model.pkl'), scaler_name=os.path.join(HERE, 'scaler.pkl'))
+    expected = pd.read_csv(mixed_csv)
+    scored = pd.read_parquet(output) if extension == 'parquet' else pd.read_csv(output)
+
+    assert rows == len(expected)
+    assert scored['notes'].tolist()[5:10] == ['corner lot'] * 5
+    assert scored['notes'].isna().sum() == 15
+    assert scored['zone'].tolist()[15:] == ['B'] * 5
+    np.testing.assert_array_equal(scored['parcels'].to_numpy(dtype=float), expected['parcels'].to_numpy(dtype=float))
+    np.testing.assert_allclose(scored[SCORE_COLUMN].to_numpy(), expected_scores(mixed_csv), rtol=1e-12)
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'csv'])
+def test_parallel_matches_serial(tmp_path, extension):
+    df = pd.read_csv(os.path.join(HERE, 'output.csv')).head(120)[['location'] + FEATURE_COLUMNS]
+    df['notes'] = ['two\nlines, "quoted"' if i % 7 == 0 else None for i in range(len(df))]
+    source = tmp_path / 'sites.csv'
+    df.to_csv(source, index=False)
+    paths = {mode: str(tmp_path / f'{mode}.{extension}') for mode in ['serial', 'parallel']}
+    models = dict(model_name=os.path.join(HERE, 'model.pkl'), scaler_name=os.path.join(HERE, 'scaler.pkl'))
+
+    predict_batch(str(source), paths['serial'], chunksize=16, **models)
+    # Small parts put record boundaries next to quoted newlines
+    rows = predict_parallel(str(source), paths['parallel'], workers=2, chunksize=16, part_bytes=300, **models)
+    read = pd.read_parquet if extension == 'parquet' else pd.read_csv
+    serial, parallel = read(paths['serial']), read(paths['parallel'])
+
+    assert rows == len(df)
+    pd.testing.assert_frame_equal(parallel.drop(columns=SCORE_COLUMN), serial.drop(columns=SCORE_COLUMN))
+    np.testing.assert_allclose(parallel[SCORE_COLUMN], serial[SCORE_COLUMN], rtol=1e-12)
+    assert parallel['notes'].iloc[0] == df['notes'].iloc[0]
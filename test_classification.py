@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from classification import CROSS_DOCKING, WAREHOUSE, check_equivalence, classify_location, classify_locations
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Every threshold in the rules, with values just either side and NaN
+EDGE_VALUES = {
+    'population': [499999, 500000, 500001, 999999, 1000000, 1000001, 2999999, 3000000, 3000001, np.nan],
+    'dist_road_qual': [799999, 800000, 800001, np.nan],
+    'tier_value': [1, 2, 3, np.nan],
+    'edi': [14999, 15000, 15001, 24999, 25000, 25001, 49999, 50000, 50001, 69999, 70000, 70001, np.nan],
+    'literacy_rate': [6, 7, 8, np.nan],
+    'railways_count': [4, 5, 6, 10, 11, 12, np.nan],
+    'average_land_price': [1999, 2000, 2001, 4999, 5000, 5001, np.nan],
+    'airport_proximity': [19, 20, 21, 29, 30, 31, 49, 50, 51, 79, 80, 81, np.nan],
+}
+
+
+def assert_equivalent(df):
+    mismatches = check_equivalence(df)
+    assert mismatches.empty, f"{len(mismatches)} rows differ:\n{mismatches}"
+
+
+def test_matches_row_wise_rules_on_csv_rows():
+    df = pd.read_csv(os.path.join(HERE, 'output.csv'))
+    assert_equivalent(df)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_matches_row_wise_rules_on_edge_values(seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({column: rng.choice(values, size=5000) for column, values in EDGE_VALUES.items()})
+    assert_equivalent(df)
+
+
+def test_matches_row_wise_rules_on_random_values():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        'population': rng.uniform(0, 5000000, n),
+        'dist_road_qual': rng.uniform(0, 2000000, n),
+        'tier_value': rng.integers(1, 4, n),
+        'edi': rng.uniform(0, 100000, n),
+        'literacy_rate': rng.integers(1, 11, n),
+        'railways_count': rng.integers(1, 13, n),
+        'average_land_price': rng.uniform(0, 10000, n),
+        'airport_proximity': rng.uniform(0, 100, n),
+    })
+    assert_equivalent(df)
+
+
+def test_labels():
+    row = {'population': 2000000, 'dist_road_qual': 900000, 'tier_value': 1, 'edi': 10000,
+           'literacy_rate': 5, 'railways_count': 8, 'average_land_price': 100, 'airport_proximity': 10}
+    warehouse = dict(row, population=600000, tier_value=3)
+    df = pd.DataFrame([row, warehouse])
+    assert classify_location(row) == CROSS_DOCKING
+    assert classify_location(warehouse) == WAREHOUSE
+    assert list(classify_locations(df)) == [CROSS_DOCKING, WAREHOUSE]
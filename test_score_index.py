@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from score_index import ScoreIndex
+
+
+def expected_nearest(scores, target, k):
+    return pd.Series(np.abs(scores - target)).nsmallest(k).index.to_numpy()
+
+
+def test_ties_across_the_target_resolve_by_row_order():
+    scores = np.array([3, 4, 9, 8, 9, 3, 6, 9, 6, 8, 6, 7, 3, 8, 1, 5, 7, 8, 5, 3, 3, 4, 4], dtype=float)
+    assert ScoreIndex(scores).nearest(5.0, 4).tolist() == [15, 18, 1, 6]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_nsmallest_on_tie_heavy_scores(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(500):
+        n = int(rng.integers(2, 40))
+        scores = rng.integers(0, 10, n).astype(float)
+        scores[rng.random(n) < 0.1] = np.nan
+        valid = int((~np.isnan(scores)).sum())
+        if valid < 2:
+            continue
+        target = float(rng.choice([rng.integers(-1, 11), rng.integers(0, 20) / 2, rng.random() * 10]))
+        # nsmallest falls back to an unstable sort once k covers every row, so stay below that
+        k = int(rng.integers(1, valid))
+        np.testing.assert_array_equal(ScoreIndex(scores).nearest(target, k), expected_nearest(scores, target, k))
+
+
+def test_update_matches_rebuilt_index():
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 10, 200).astype(float)
+    index = ScoreIndex(scores)
+    for _ in range(50):
+        positions = rng.choice(len(scores) + 20, size=5, replace=False)
+        values = rng.integers(0, 10, 5).astype(float)
+        values[rng.random(5) < 0.2] = np.nan
+        grow = positions.max() + 1 - len(scores)
+        if grow > 0:
+            scores = np.concatenate([scores, np.full(grow, np.nan)])
+        scores[positions] = values
+        index.update(positions, values)
+        for target in [0.0, 4.5, 5.0, 9.0]:
+            np.testing.assert_array_equal(index.nearest(target, 7), expected_nearest(scores, target, 7))
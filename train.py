@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from model_registry import FEATURE_COLUMNS
+
+TARGET_COLUMN = 'suitability_score'
+MODELS_DIR = 'models'
+ESTIMATORS = ['random_forest', 'linear']
+
+
+def load_training_data(path='output.csv'):
+    """(features DataFrame, target array) from a CSV or Parquet feature table; unscored rows are dropped"""
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    if path.endswith(('.parquet', '.pq')):
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    df = df.dropna(subset=[TARGET_COLUMN])
+    return df[FEATURE_COLUMNS].astype(np.float64), df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+
+def data_hash(features, target):
+    """SHA-256 of the training matrix and target, in FEATURE_COLUMNS order"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(features[FEATURE_COLUMNS].to_numpy(dtype=np.float64)).tobytes())
+    digest.update(np.ascontiguousarray(target, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def fit(features, target, estimator='random_forest', n_estimators=200, n_jobs=-1, random_state=0,
+        previous=None, add_estimators=50):
+    """
+    Fit the scaler and model on the feature table
+    estimator: 'random_forest' (trees built in parallel over n_jobs) or 'linear'
+    previous: (model, scaler) to warm-start from; the forest keeps its trees and
+              grows add_estimators more on the current data, and the scaler is
+              reused so the existing trees' split thresholds stay valid
+              (estimator must be 'random_forest')
+    Returns (model, scaler)
+    """
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"❌ estimator must be one of {ESTIMATORS}, got '{estimator}'")
+
+    if previous is not None:
+        if estimator != 'random_forest':
+            raise ValueError(f"❌ Warm start only grows a random forest, got estimator '{estimator}'")
+        model, scaler = previous
+        if not isinstance(model, RandomForestRegressor):
+            raise ValueError(f"❌ Warm start needs a RandomForestRegressor, got {type(model).__name__}")
+        scaled = scaler.transform(features)
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_estimators, n_jobs=n_jobs)
+        model.fit(scaled, target)
+        return model, scaler
+
+    # Fitted on a labelled frame, as the shipped scaler.pkl was; the model sees the plain array
+    scaler = StandardScaler().fit(features)
+    scaled = scaler.transform(features)
+    if estimator == 'random_forest':
+        model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=n_jobs, random_state=random_state)
+    else:
+        model = LinearRegression(n_jobs=n_jobs)
+    model.fit(scaled, target)
+    return model, scaler
+
+
+def list_versions(models_dir=MODELS_DIR):
+    """Version directories in the order they were written"""
+    if not os.path.isdir(models_dir):
+        return []
+    return [os.path.join(models_dir, name) for name in sorted(os.listdir(models_dir)) if name.isdigit()]
+
+
+def load_version(version_dir):
+    """(model, scaler, metadata) stored in a version directory"""
+    with open(os.path.join(version_dir, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(version_dir, 'scaler.pkl'), 'rb') as f:
+        scaler = pickle.load(f)
+    with open(os.path.join(version_dir, 'metadata.json')) as f:
+        metadata = json.load(f)
+    return model, scaler, metadata
+
+
+def save_version(model, scaler, metadata, models_dir=MODELS_DIR):
+    """Write model.pkl, scaler.pkl and metadata.json as the next numbered version; return its directory"""
+    existing = list_versions(models_dir)
+    number = int(os.path.basename(existing[-1])) + 1 if existing else 1
+    version_dir = os.path.join(models_dir, f"{number:06d}")
+    # Assemble in a temporary directory and rename, so a version is never seen half-written
+    os.makedirs(models_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=models_dir, prefix=f"{os.path.basename(version_dir)}.", suffix='.tmp')
+    os.chmod(tmp_dir, 0o755)  # mkdtemp creates it owner-only
+    for name, obj in [('model', model), ('scaler', scaler)]:
+        payload = pickle.dumps(obj)
+        with open(os.path.join(tmp_dir, f"{name}.pkl"), 'wb') as f:
+            f.write(payload)
+        # Same hash the registry reports as the artifact version once published
+        metadata[f"{name}_sha256"] = hashlib.sha256(payload).hexdigest()
+    metadata['version'] = os.path.basename(version_dir)
+    with open(os.path.join(tmp_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.rename(tmp_dir, version_dir)
+    return version_dir
+
+
+def publish(version_dir, model_path='model.pkl', scaler_path='scaler.pkl'):
+    """Install a version as the artifacts the app serves; the registry reloads them by content hash"""
+    for name, target in [('model.pkl', model_path), ('scaler.pkl', scaler_path)]:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)),
+                                        prefix=f"{os.path.basename(target)}.", suffix='.tmp')
+        os.close(fd)
+        # copy() also brings the source's permission bits over mkstemp's owner-only ones
+        shutil.copy(os.path.join(version_dir, name), tmp_path)
+        os.replace(tmp_path, target)
+
+
+def train(data='output.csv', estimator='random_forest', n_estimators=200, n_jobs=-1, random_state=0,
+          warm_start=None, add_estimators=50, models_dir=MODELS_DIR):
+    """
+    Fit on a feature table and save the result as a new version
+    warm_start: version directory to continue from (None = fit from scratch)
+    Returns the new version directory
+    """
+    features, target = load_training_data(data)
+    previous, parent = None, None
+    if warm_start is not None:
+        model, scaler, parent = load_version(warm_start)
+        previous = (model, scaler)
+
+    start = time.perf_counter()
+    model, scaler = fit(features, target, estimator, n_estimators, n_jobs, random_state, previous, add_estimators)
+    fit_seconds = time.perf_counter() - start
+
+    metadata = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'parent': parent['version'] if parent else None,
+        'estimator': type(model).__name__,
+        'params': {key: value for key, value in model.get_params().items()
+                   if value is None or isinstance(value, (bool, int, float, str))},
+        'feature_columns': FEATURE_COLUMNS,
+        'target_column': TARGET_COLUMN,
+        'data_path': os.path.abspath(data),
+        'data_sha256': data_hash(features, target),
+        'rows': len(target),
+        'fit_seconds': round(fit_seconds, 3),
+        'train_r2': float(model.score(scaler.transform(features), target)),
+        'sklearn_version': sklearn.__version__,
+    }
+    return save_version(model, scaler, metadata, models_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the suitability model and write a versioned artifact")
+    parser.add_argument('--data', default='output.csv', help="CSV or Parquet feature table with suitability_score")
+    parser.add_argument('--estimator', choices=ESTIMATORS, default='random_forest')
+    parser.add_argument('--n-estimators', type=int, default=200, help="trees in a new forest")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="parallel jobs (-1 = all cores)")
+    parser.add_argument('--random-state', type=int, default=0)
+    parser.add_argument('--warm-start', nargs='?', const='latest', default=None,
+                        help="continue from a version directory (default: the latest version)")
+    parser.add_argument('--add-estimators', type=int, default=50, help="trees added by a warm start")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--publish', action='store_true', help="install the new version as model.pkl/scaler.pkl")
+    args = parser.parse_args()
+
+    warm_start = args.warm_start
+    if warm_start is not None and args.estimator != 'random_forest':
+        parser.error(f"--warm-start continues a random forest and cannot be combined with --estimator {args.estimator}")
+    if warm_start == 'latest':
+        versions = list_versions(args.models_dir)
+        if not versions:
+            parser.error(f"no versions in '{args.models_dir}' to warm-start from")
+        warm_start = versions[-1]
+
+    version_dir = train(args.data, args.estimator, args.n_estimators, args.n_jobs, args.random_state,
+                        warm_start, args.add_estimators, args.models_dir)
+    _, _, metadata = load_version(version_dir)
+    print(f"✅ Trained {metadata['estimator']} on {metadata['rows']} rows in {metadata['fit_seconds']}s "
+          f"(train R² {metadata['train_r2']:.4f}) -> '{version_dir}'")
+    if args.publish:
+        publish(version_dir)
+        print("   Published as model.pkl / scaler.pkl")
+
+
+if __name__ == "__main__":
+    main()